@@ -1,10 +1,26 @@
 from flask import request, jsonify, session
 from models import db, User, Project, Experience, Achievement, Like, Comment, File
-from datetime import datetime
+from search_service import SearchService
+from technology_service import TechnologyService, TAGGED_MODELS
+from stats_service import StatsService
+from rollups import INTERVALS
+from write_queue import WriteQueueBusy
+import pool_metrics
+from serializers import InvalidFields, make_excerpt, USER, PROJECT, EXPERIENCE, ACHIEVEMENT, COMMENT
+from datetime import datetime, timedelta, timezone
 import uuid
 
+MAX_THREAD_DEPTH = 10
+MAX_TIMESERIES_DAYS = 5 * 366
+MAX_BULK_OPERATIONS = 500
+
 def admin_routes(app):
     
+    write_queue = app.extensions['write_queue']
+    response_cache = app.extensions['response_cache']
+    invalidation_bus = app.extensions['invalidation_bus']
+    rollups = app.extensions['rollups']
+
     def admin_required(f):
         def decorated_function(*args, **kwargs):
             if 'user_id' not in session:
@@ -26,59 +42,168 @@ def admin_routes(app):
         decorated_function.__name__ = f.__name__
         return decorated_function
 
-    # Helper functions
-    def project_to_dict(project: Project):
-        return {
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'imageUrl': project.image_url,
-            'githubUrl': project.github_url,
-            'liveUrl': project.live_url,
-            'technologies': project.technologies or [],
-            'featured': project.featured,
-            'published': project.published,
-            'linkedinPost': project.linkedin_post,
-            'linkedinPostUrl': project.linkedin_post_url,
-            'additionalImages': project.additional_images or [],
-            'createdAt': project.created_at.isoformat() if project.created_at else None,
-            'updatedAt': project.updated_at.isoformat() if project.updated_at else None
-        }
-
-    def experience_to_dict(experience: Experience):
-        return {
-            'id': experience.id,
-            'position': experience.position,
-            'company': experience.company,
-            'startDate': experience.start_date.isoformat() if experience.start_date else None,
-            'endDate': experience.end_date.isoformat() if experience.end_date else None,
-            'description': experience.description,
-            'technologies': experience.technologies or [],
-            'published': experience.published,
-            'linkedinPost': experience.linkedin_post,
-            'linkedinPostUrl': experience.linkedin_post_url,
-            'companyLogoUrl': experience.company_logo_url,
-            'additionalImages': experience.additional_images or [],
-            'createdAt': experience.created_at.isoformat() if experience.created_at else None,
-            'updatedAt': experience.updated_at.isoformat() if experience.updated_at else None
-        }
-
-    def achievement_to_dict(achievement: Achievement):
-        return {
-            'id': achievement.id,
-            'title': achievement.title,
-            'description': achievement.description,
-            'date': achievement.date.isoformat() if achievement.date else None,
-            'type': achievement.type,
-            'certificateUrl': achievement.certificate_url,
-            'published': achievement.published,
-            'linkedinPost': achievement.linkedin_post,
-            'linkedinPostUrl': achievement.linkedin_post_url,
-            'badgeImageUrl': achievement.badge_image_url,
-            'additionalImages': achievement.additional_images or [],
-            'createdAt': achievement.created_at.isoformat() if achievement.created_at else None,
-            'updatedAt': achievement.updated_at.isoformat() if achievement.updated_at else None
-        }
+    def build_comment_threads(comments, max_depth):
+        """Nest an oldest-first list of serialized comments into threads in a single pass"""
+        nodes = {}
+        threads = []
+        for node in comments:
+            node['replies'] = []
+            node['replyCount'] = 0
+            parent = nodes.get(node['parentId'])
+            # Parents are always older than their replies, so they are already in `nodes`
+            if parent is None:
+                node['depth'] = 0
+                threads.append(node)
+            else:
+                node['depth'] = parent['depth'] + 1
+                parent['replyCount'] += 1
+                if node['depth'] <= max_depth:
+                    parent['replies'].append(node)
+            nodes[node['id']] = node
+        return threads
+
+    def comments_with_user_info(query):
+        """Serialize comments with their author's name and email, joined in the same query"""
+        query = query.add_columns(
+            User.first_name.label('userFirstName'), User.last_name.label('userLastName'), User.email.label('userEmail')
+        ).outerjoin(User, User.id == Comment.user_id)
+        comments = COMMENT.fetch(query)
+        for comment in comments:
+            first_name = comment.pop('userFirstName')
+            last_name = comment.pop('userLastName')
+            email = comment.pop('userEmail')
+            if email is not None:
+                comment['userInfo'] = {'firstName': first_name, 'lastName': last_name, 'email': email}
+        return comments
+
+    def parse_datetime(value):
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Stored naive in UTC; an aware value would never compare equal to the stored one
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+    def set_project_fields(project, data):
+        if 'title' in data:
+            project.title = data['title']
+        if 'description' in data:
+            project.description = data['description']
+            project.excerpt = make_excerpt(project.description)
+        if 'imageUrl' in data:
+            project.image_url = data['imageUrl']
+        if 'githubUrl' in data:
+            project.github_url = data['githubUrl']
+        if 'liveUrl' in data:
+            project.live_url = data['liveUrl']
+        if 'technologies' in data:
+            project.technologies = data['technologies']
+        if 'featured' in data:
+            project.featured = data['featured']
+        if 'published' in data:
+            project.published = data['published']
+        if 'linkedinPost' in data:
+            project.linkedin_post = data['linkedinPost']
+        if 'linkedinPostUrl' in data:
+            project.linkedin_post_url = data['linkedinPostUrl']
+        if 'additionalImages' in data:
+            project.additional_images = data['additionalImages']
+        if 'sortOrder' in data:
+            project.sort_order = data['sortOrder']
+
+    def set_experience_fields(experience, data):
+        if 'position' in data:
+            experience.position = data['position']
+        if 'company' in data:
+            experience.company = data['company']
+        if 'startDate' in data and data['startDate']:
+            experience.start_date = parse_datetime(data['startDate'])
+        if 'endDate' in data:
+            experience.end_date = parse_datetime(data['endDate']) if data['endDate'] else None
+        if 'description' in data:
+            experience.description = data['description']
+            experience.excerpt = make_excerpt(experience.description)
+        if 'technologies' in data:
+            experience.technologies = data['technologies']
+        if 'published' in data:
+            experience.published = data['published']
+        if 'linkedinPost' in data:
+            experience.linkedin_post = data['linkedinPost']
+        if 'linkedinPostUrl' in data:
+            experience.linkedin_post_url = data['linkedinPostUrl']
+        if 'companyLogoUrl' in data:
+            experience.company_logo_url = data['companyLogoUrl']
+        if 'additionalImages' in data:
+            experience.additional_images = data['additionalImages']
+        if 'sortOrder' in data:
+            experience.sort_order = data['sortOrder']
+
+    def set_achievement_fields(achievement, data):
+        if 'title' in data:
+            achievement.title = data['title']
+        if 'description' in data:
+            achievement.description = data['description']
+            achievement.excerpt = make_excerpt(achievement.description)
+        if 'date' in data and data['date']:
+            achievement.date = parse_datetime(data['date'])
+        if 'type' in data:
+            achievement.type = data['type']
+        if 'certificateUrl' in data:
+            achievement.certificate_url = data['certificateUrl']
+        if 'published' in data:
+            achievement.published = data['published']
+        if 'linkedinPost' in data:
+            achievement.linkedin_post = data['linkedinPost']
+        if 'linkedinPostUrl' in data:
+            achievement.linkedin_post_url = data['linkedinPostUrl']
+        if 'badgeImageUrl' in data:
+            achievement.badge_image_url = data['badgeImageUrl']
+        if 'additionalImages' in data:
+            achievement.additional_images = data['additionalImages']
+        if 'sortOrder' in data:
+            achievement.sort_order = data['sortOrder']
+
+    # Item type -> (model, serializer, field setter, values of new items for omitted keys)
+    EDITABLE_ITEMS = {
+        'project': (Project, PROJECT, set_project_fields, {
+            'technologies': [], 'featured': False, 'published': False, 'additionalImages': []
+        }),
+        'experience': (Experience, EXPERIENCE, set_experience_fields, {
+            'technologies': [], 'published': False, 'additionalImages': []
+        }),
+        'achievement': (Achievement, ACHIEVEMENT, set_achievement_fields, {
+            'published': False, 'additionalImages': []
+        }),
+    }
+
+    def save_item(item_type, item, data):
+        """Create (item=None) or update an item with its index rows. The caller commits.
+        
+        Returns the item, or None for an update that leaves every value as it was.
+        """
+        model, _, set_fields, defaults = EDITABLE_ITEMS[item_type]
+        if item is None:
+            item = model()
+            set_fields(item, {**defaults, **data})
+            if 'sortOrder' not in data:
+                # New items go to the end of the list
+                item.sort_order = (db.session.execute(db.select(db.func.max(model.sort_order))).scalar() or 0) + 1
+            db.session.add(item)
+            db.session.flush()
+        else:
+            set_fields(item, data)
+            if not db.session.is_modified(item):
+                return None
+            item.updated_at = datetime.utcnow()
+        SearchService.index_item(item_type, item)
+        if item_type in TAGGED_MODELS:
+            TechnologyService.sync_item(item_type, item)
+        return item
+
+    def delete_item(item_type, item):
+        """Delete an item with its index and stats rows. The caller commits"""
+        SearchService.remove_item(item_type, item.id)
+        StatsService.remove_item(item_type, item.id)
+        if item_type in TAGGED_MODELS:
+            TechnologyService.remove_item(item_type, item.id)
+        db.session.delete(item)
 
     # Admin Projects Routes
     @app.route('/api/admin/projects', methods=['GET'])
@@ -86,8 +211,11 @@ def admin_routes(app):
     @admin_required
     def get_all_projects():
         try:
-            projects = Project.query.all()
-            return jsonify([project_to_dict(p) for p in projects])
+            return jsonify(PROJECT.fetch(
+                PROJECT.select(PROJECT.parse_fields(request.args.get('fields'))).order_by(Project.sort_order, Project.id)
+            ))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch projects'}), 500
 
@@ -96,25 +224,11 @@ def admin_routes(app):
     @admin_required
     def create_project():
         try:
-            data = request.get_json()
-            
-            project = Project()
-            project.title = data.get('title')
-            project.description = data.get('description')
-            project.image_url = data.get('imageUrl')
-            project.github_url = data.get('githubUrl')
-            project.live_url = data.get('liveUrl')
-            project.technologies = data.get('technologies', [])
-            project.featured = data.get('featured', False)
-            project.published = data.get('published', False)
-            project.linkedin_post = data.get('linkedinPost')
-            project.linkedin_post_url = data.get('linkedinPostUrl')
-            project.additional_images = data.get('additionalImages', [])
-            
-            db.session.add(project)
+            project = save_item('project', None, request.get_json())
             db.session.commit()
+            invalidation_bus.bump('project')
             
-            return jsonify(project_to_dict(project))
+            return jsonify(PROJECT.dump(project))
         except Exception as e:
             return jsonify({'message': 'Failed to create project'}), 500
 
@@ -127,35 +241,14 @@ def admin_routes(app):
             if not project:
                 return jsonify({'message': 'Project not found'}), 404
             
-            data = request.get_json()
+            # Autosave often resubmits unchanged values: keep updated_at, caches and ETags as they are
+            if save_item('project', project, request.get_json()) is None:
+                return jsonify(PROJECT.dump(project))
             
-            if 'title' in data:
-                project.title = data['title']
-            if 'description' in data:
-                project.description = data['description']
-            if 'imageUrl' in data:
-                project.image_url = data['imageUrl']
-            if 'githubUrl' in data:
-                project.github_url = data['githubUrl']
-            if 'liveUrl' in data:
-                project.live_url = data['liveUrl']
-            if 'technologies' in data:
-                project.technologies = data['technologies']
-            if 'featured' in data:
-                project.featured = data['featured']
-            if 'published' in data:
-                project.published = data['published']
-            if 'linkedinPost' in data:
-                project.linkedin_post = data['linkedinPost']
-            if 'linkedinPostUrl' in data:
-                project.linkedin_post_url = data['linkedinPostUrl']
-            if 'additionalImages' in data:
-                project.additional_images = data['additionalImages']
-            
-            project.updated_at = datetime.utcnow()
             db.session.commit()
+            invalidation_bus.bump('project')
             
-            return jsonify(project_to_dict(project))
+            return jsonify(PROJECT.dump(project))
         except Exception as e:
             return jsonify({'message': 'Failed to update project'}), 500
 
@@ -168,8 +261,9 @@ def admin_routes(app):
             if not project:
                 return jsonify({'message': 'Project not found'}), 404
             
-            db.session.delete(project)
+            delete_item('project', project)
             db.session.commit()
+            invalidation_bus.bump('project')
             
             return jsonify({'message': 'Project deleted successfully'})
         except Exception as e:
@@ -181,8 +275,11 @@ def admin_routes(app):
     @admin_required
     def get_all_experiences():
         try:
-            experiences = Experience.query.all()
-            return jsonify([experience_to_dict(e) for e in experiences])
+            return jsonify(EXPERIENCE.fetch(
+                EXPERIENCE.select(EXPERIENCE.parse_fields(request.args.get('fields'))).order_by(Experience.sort_order, Experience.id)
+            ))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch experiences'}), 500
 
@@ -191,28 +288,11 @@ def admin_routes(app):
     @admin_required
     def create_experience():
         try:
-            data = request.get_json()
-            
-            start_date = datetime.fromisoformat(data['startDate'].replace('Z', '+00:00')) if data.get('startDate') else None
-            end_date = datetime.fromisoformat(data['endDate'].replace('Z', '+00:00')) if data.get('endDate') else None
-            
-            experience = Experience()
-            experience.position = data.get('position')
-            experience.company = data.get('company')
-            experience.start_date = start_date
-            experience.end_date = end_date
-            experience.description = data.get('description')
-            experience.technologies = data.get('technologies', [])
-            experience.published = data.get('published', False)
-            experience.linkedin_post = data.get('linkedinPost')
-            experience.linkedin_post_url = data.get('linkedinPostUrl')
-            experience.company_logo_url = data.get('companyLogoUrl')
-            experience.additional_images = data.get('additionalImages', [])
-            
-            db.session.add(experience)
+            experience = save_item('experience', None, request.get_json())
             db.session.commit()
+            invalidation_bus.bump('experience')
             
-            return jsonify(experience_to_dict(experience))
+            return jsonify(EXPERIENCE.dump(experience))
         except Exception as e:
             return jsonify({'message': 'Failed to create experience'}), 500
 
@@ -225,35 +305,14 @@ def admin_routes(app):
             if not experience:
                 return jsonify({'message': 'Experience not found'}), 404
             
-            data = request.get_json()
+            # Autosave often resubmits unchanged values: keep updated_at, caches and ETags as they are
+            if save_item('experience', experience, request.get_json()) is None:
+                return jsonify(EXPERIENCE.dump(experience))
             
-            if 'position' in data:
-                experience.position = data['position']
-            if 'company' in data:
-                experience.company = data['company']
-            if 'startDate' in data and data['startDate']:
-                experience.start_date = datetime.fromisoformat(data['startDate'].replace('Z', '+00:00'))
-            if 'endDate' in data:
-                experience.end_date = datetime.fromisoformat(data['endDate'].replace('Z', '+00:00')) if data['endDate'] else None
-            if 'description' in data:
-                experience.description = data['description']
-            if 'technologies' in data:
-                experience.technologies = data['technologies']
-            if 'published' in data:
-                experience.published = data['published']
-            if 'linkedinPost' in data:
-                experience.linkedin_post = data['linkedinPost']
-            if 'linkedinPostUrl' in data:
-                experience.linkedin_post_url = data['linkedinPostUrl']
-            if 'companyLogoUrl' in data:
-                experience.company_logo_url = data['companyLogoUrl']
-            if 'additionalImages' in data:
-                experience.additional_images = data['additionalImages']
-            
-            experience.updated_at = datetime.utcnow()
             db.session.commit()
+            invalidation_bus.bump('experience')
             
-            return jsonify(experience_to_dict(experience))
+            return jsonify(EXPERIENCE.dump(experience))
         except Exception as e:
             return jsonify({'message': 'Failed to update experience'}), 500
 
@@ -266,8 +325,9 @@ def admin_routes(app):
             if not experience:
                 return jsonify({'message': 'Experience not found'}), 404
             
-            db.session.delete(experience)
+            delete_item('experience', experience)
             db.session.commit()
+            invalidation_bus.bump('experience')
             
             return jsonify({'message': 'Experience deleted successfully'})
         except Exception as e:
@@ -279,8 +339,11 @@ def admin_routes(app):
     @admin_required
     def get_all_achievements():
         try:
-            achievements = Achievement.query.all()
-            return jsonify([achievement_to_dict(a) for a in achievements])
+            return jsonify(ACHIEVEMENT.fetch(
+                ACHIEVEMENT.select(ACHIEVEMENT.parse_fields(request.args.get('fields'))).order_by(Achievement.sort_order, Achievement.id)
+            ))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch achievements'}), 500
 
@@ -289,26 +352,11 @@ def admin_routes(app):
     @admin_required
     def create_achievement():
         try:
-            data = request.get_json()
-            
-            date = datetime.fromisoformat(data['date'].replace('Z', '+00:00')) if data.get('date') else None
-            
-            achievement = Achievement()
-            achievement.title = data.get('title')
-            achievement.description = data.get('description')
-            achievement.date = date
-            achievement.type = data.get('type')
-            achievement.certificate_url = data.get('certificateUrl')
-            achievement.published = data.get('published', False)
-            achievement.linkedin_post = data.get('linkedinPost')
-            achievement.linkedin_post_url = data.get('linkedinPostUrl')
-            achievement.badge_image_url = data.get('badgeImageUrl')
-            achievement.additional_images = data.get('additionalImages', [])
-            
-            db.session.add(achievement)
+            achievement = save_item('achievement', None, request.get_json())
             db.session.commit()
+            invalidation_bus.bump('achievement')
             
-            return jsonify(achievement_to_dict(achievement))
+            return jsonify(ACHIEVEMENT.dump(achievement))
         except Exception as e:
             return jsonify({'message': 'Failed to create achievement'}), 500
 
@@ -321,33 +369,14 @@ def admin_routes(app):
             if not achievement:
                 return jsonify({'message': 'Achievement not found'}), 404
             
-            data = request.get_json()
+            # Autosave often resubmits unchanged values: keep updated_at, caches and ETags as they are
+            if save_item('achievement', achievement, request.get_json()) is None:
+                return jsonify(ACHIEVEMENT.dump(achievement))
             
-            if 'title' in data:
-                achievement.title = data['title']
-            if 'description' in data:
-                achievement.description = data['description']
-            if 'date' in data and data['date']:
-                achievement.date = datetime.fromisoformat(data['date'].replace('Z', '+00:00'))
-            if 'type' in data:
-                achievement.type = data['type']
-            if 'certificateUrl' in data:
-                achievement.certificate_url = data['certificateUrl']
-            if 'published' in data:
-                achievement.published = data['published']
-            if 'linkedinPost' in data:
-                achievement.linkedin_post = data['linkedinPost']
-            if 'linkedinPostUrl' in data:
-                achievement.linkedin_post_url = data['linkedinPostUrl']
-            if 'badgeImageUrl' in data:
-                achievement.badge_image_url = data['badgeImageUrl']
-            if 'additionalImages' in data:
-                achievement.additional_images = data['additionalImages']
-            
-            achievement.updated_at = datetime.utcnow()
             db.session.commit()
+            invalidation_bus.bump('achievement')
             
-            return jsonify(achievement_to_dict(achievement))
+            return jsonify(ACHIEVEMENT.dump(achievement))
         except Exception as e:
             return jsonify({'message': 'Failed to update achievement'}), 500
 
@@ -360,30 +389,165 @@ def admin_routes(app):
             if not achievement:
                 return jsonify({'message': 'Achievement not found'}), 404
             
-            db.session.delete(achievement)
+            delete_item('achievement', achievement)
             db.session.commit()
+            invalidation_bus.bump('achievement')
             
             return jsonify({'message': 'Achievement deleted successfully'})
         except Exception as e:
             return jsonify({'message': 'Failed to delete achievement'}), 500
 
+    # Bulk Admin Routes
+    def bulk_mutation(item_type):
+        model, serializer, _, _ = EDITABLE_ITEMS[item_type]
+
+        def apply_operations():
+            try:
+                payload = request.get_json(silent=True)
+                operations = payload.get('operations') if isinstance(payload, dict) else None
+                if not isinstance(operations, list) or not operations:
+                    return jsonify({'message': 'operations must be a non-empty list'}), 400
+                if len(operations) > MAX_BULK_OPERATIONS:
+                    return jsonify({'message': f'At most {MAX_BULK_OPERATIONS} operations per request'}), 400
+                
+                # Validate everything up front so a bad operation rejects the batch before any write
+                for index, operation in enumerate(operations):
+                    op = operation.get('op') if isinstance(operation, dict) else None
+                    if op not in ('create', 'update', 'delete'):
+                        return jsonify({'message': 'op must be create, update or delete', 'index': index}), 400
+                    if op != 'create' and not isinstance(operation.get('id'), str):
+                        return jsonify({'message': 'id is required', 'index': index}), 400
+                    if op != 'delete' and not isinstance(operation.get('data', {}), dict):
+                        return jsonify({'message': 'data must be an object', 'index': index}), 400
+                
+                # One query loads every item the batch touches
+                ids = {operation['id'] for operation in operations if operation['op'] != 'create'}
+                items = {item.id: item for item in model.query.filter(model.id.in_(ids))} if ids else {}
+                deleted = set()
+                for index, operation in enumerate(operations):
+                    if operation['op'] == 'create':
+                        continue
+                    if operation['id'] not in items or operation['id'] in deleted:
+                        return jsonify({'message': f'{item_type.capitalize()} not found', 'index': index}), 404
+                    if operation['op'] == 'delete':
+                        deleted.add(operation['id'])
+                
+                results = []
+                for index, operation in enumerate(operations):
+                    op = operation['op']
+                    try:
+                        if op == 'delete':
+                            delete_item(item_type, items[operation['id']])
+                            results.append({'op': op, 'id': operation['id']})
+                        elif op == 'update':
+                            item = items[operation['id']]
+                            changed = save_item(item_type, item, operation.get('data', {})) is not None
+                            results.append({'op': op, 'id': item.id, 'item': item, 'changed': changed})
+                        else:
+                            item = save_item(item_type, None, operation.get('data', {}))
+                            results.append({'op': op, 'id': item.id, 'item': item})
+                    except Exception as e:
+                        # Invalid dates, missing required fields...: nothing from the batch is kept
+                        db.session.rollback()
+                        return jsonify({'message': f'Operation {index} ({op}) failed', 'index': index}), 400
+                
+                db.session.flush()
+                for result in results:
+                    if 'item' in result:
+                        result['item'] = serializer.dump(result['item'])
+                if not any(result.get('changed', True) for result in results):
+                    return jsonify({'results': results})
+                db.session.commit()
+                invalidation_bus.bump(item_type)
+                
+                return jsonify({'results': results})
+            except Exception as e:
+                db.session.rollback()
+                return jsonify({'message': f'Failed to apply {item_type} operations'}), 500
+        
+        app.add_url_rule(
+            f'/api/admin/{item_type}s/bulk', f'bulk_{item_type}s',
+            login_required(admin_required(apply_operations)), methods=['POST']
+        )
+
+    def reorder_items(item_type):
+        model = EDITABLE_ITEMS[item_type][0]
+
+        def apply_order():
+            payload = request.get_json(silent=True)
+            ids = payload.get('ids') if isinstance(payload, dict) else None
+            if not isinstance(ids, list) or not ids or not all(isinstance(item_id, str) for item_id in ids) or len(set(ids)) != len(ids):
+                return jsonify({'message': 'ids must be a non-empty list of unique ids'}), 400
+            
+            try:
+                current = dict(db.session.execute(db.select(model.id, model.sort_order).order_by(model.sort_order, model.id)).all())
+                if not set(ids) <= current.keys():
+                    return jsonify({'message': f'{item_type.capitalize()} not found'}), 404
+                
+                # Listed items first, in the given order; the others follow in their current order
+                listed = set(ids)
+                order = ids + [item_id for item_id in current if item_id not in listed]
+                changes = [
+                    {'id': item_id, 'sort_order': index}
+                    for index, item_id in enumerate(order) if current[item_id] != index
+                ]
+                if changes:
+                    db.session.execute(db.update(model), changes)
+                    db.session.commit()
+                    invalidation_bus.bump(item_type)
+                
+                return jsonify({'ids': order})
+            except Exception as e:
+                db.session.rollback()
+                return jsonify({'message': f'Failed to reorder {item_type}s'}), 500
+        
+        app.add_url_rule(
+            f'/api/admin/{item_type}s/order', f'reorder_{item_type}s',
+            login_required(admin_required(apply_order)), methods=['PUT']
+        )
+
+    for item_type in EDITABLE_ITEMS:
+        bulk_mutation(item_type)
+        reorder_items(item_type)
+
     # Comments Routes
     @app.route('/api/comments/<item_type>/<item_id>', methods=['GET'])
+    @response_cache.cached('comment')
     def get_comments(item_type, item_id):
         try:
-            comments = Comment.query.filter_by(item_type=item_type, item_id=item_id).all()
-            return jsonify([{
-                'id': c.id,
-                'userId': c.user_id,
-                'authorName': c.author_name,
-                'authorEmail': c.author_email,
-                'itemType': c.item_type,
-                'itemId': c.item_id,
-                'content': c.content,
-                'parentId': c.parent_id,
-                'createdAt': c.created_at.isoformat() if c.created_at else None,
-                'updatedAt': c.updated_at.isoformat() if c.updated_at else None
-            } for c in comments])
+            if request.args.get('threaded') not in ('1', 'true'):
+                return jsonify(COMMENT.fetch(
+                    COMMENT.select(COMMENT.parse_fields(request.args.get('fields'))).where(Comment.item_type == item_type, Comment.item_id == item_id)
+                ))
+            
+            max_depth = min(max(int(request.args.get('depth', MAX_THREAD_DEPTH)), 0), MAX_THREAD_DEPTH)
+            page = max(int(request.args.get('page', 1)), 1)
+            per_page = min(max(int(request.args.get('perPage', 20)), 1), 100)
+            
+            # Threading needs the id and parentId of every comment
+            fields = COMMENT.parse_fields(request.args.get('fields'), required=('id', 'parentId'))
+            comments = COMMENT.fetch(
+                COMMENT.select(fields).where(Comment.item_type == item_type, Comment.item_id == item_id).order_by(
+                    Comment.created_at.asc(), Comment.id.asc()
+                )
+            )
+            
+            # Newest threads first, replies in chronological order
+            threads = build_comment_threads(comments, max_depth)
+            threads.reverse()
+            start = (page - 1) * per_page
+            
+            return jsonify({
+                'threads': threads[start:start + per_page],
+                'page': page,
+                'perPage': per_page,
+                'totalThreads': len(threads),
+                'totalComments': len(comments)
+            })
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
+        except ValueError:
+            return jsonify({'message': 'Invalid pagination parameters'}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch comments'}), 500
 
@@ -392,38 +556,37 @@ def admin_routes(app):
         try:
             data = request.get_json()
             
-            comment = Comment()
+            user_id = session.get('user_id')
+            # Anonymous comment - require name and email
+            if not user_id and (not data.get('authorName') or not data.get('authorEmail')):
+                return jsonify({'message': 'Nome e email são obrigatórios para comentários anônimos'}), 400
             
-            # If user is logged in, use their info
-            if 'user_id' in session:
-                comment.user_id = session['user_id']
-            else:
-                # Anonymous comment - require name and email
-                if not data.get('authorName') or not data.get('authorEmail'):
-                    return jsonify({'message': 'Nome e email são obrigatórios para comentários anônimos'}), 400
-                comment.author_name = data.get('authorName')
-                comment.author_email = data.get('authorEmail')
-            
-            comment.item_type = data.get('itemType')
-            comment.item_id = data.get('itemId')
-            comment.content = data.get('content')
-            comment.parent_id = data.get('parentId')
-            
-            db.session.add(comment)
-            db.session.commit()
+            def save_comment():
+                comment = Comment()
+                
+                # If user is logged in, use their info
+                if user_id:
+                    comment.user_id = user_id
+                else:
+                    comment.author_name = data.get('authorName')
+                    comment.author_email = data.get('authorEmail')
+                
+                comment.item_type = data.get('itemType')
+                comment.item_id = data.get('itemId')
+                comment.content = data.get('content')
+                comment.parent_id = data.get('parentId')
+                
+                db.session.add(comment)
+                db.session.flush()
+                StatsService.comment_added(comment)
+                db.session.commit()
+                invalidation_bus.bump('comment', 'engagement')
+                
+                return COMMENT.dump(comment)
             
-            return jsonify({
-                'id': comment.id,
-                'userId': comment.user_id,
-                'authorName': comment.author_name,
-                'authorEmail': comment.author_email,
-                'itemType': comment.item_type,
-                'itemId': comment.item_id,
-                'content': comment.content,
-                'parentId': comment.parent_id,
-                'createdAt': comment.created_at.isoformat() if comment.created_at else None,
-                'updatedAt': comment.updated_at.isoformat() if comment.updated_at else None
-            })
+            return jsonify(write_queue.submit(save_comment))
+        except WriteQueueBusy:
+            return jsonify({'message': 'Server busy, please try again'}), 503, {'Retry-After': '1'}
         except Exception as e:
             return jsonify({'message': 'Failed to create comment'}), 500
 
@@ -440,28 +603,37 @@ def admin_routes(app):
             if not item_type or not item_id:
                 return jsonify({'message': 'itemType and itemId are required'}), 400
             
-            # Check if like already exists
-            existing_like = Like.query.filter_by(
-                user_id=user_id,
-                item_type=item_type,
-                item_id=item_id
-            ).first()
-            
-            if existing_like:
-                # Unlike
-                db.session.delete(existing_like)
-                db.session.commit()
-                return jsonify({'liked': False, 'message': 'Like removed'})
-            else:
-                # Like
-                like = Like()
-                like.user_id = user_id
-                like.item_type = item_type
-                like.item_id = item_id
-                db.session.add(like)
-                db.session.commit()
-                return jsonify({'liked': True, 'message': 'Like added'})
+            def apply_toggle():
+                # Check if like already exists
+                existing_like = Like.query.filter_by(
+                    user_id=user_id,
+                    item_type=item_type,
+                    item_id=item_id
+                ).first()
                 
+                if existing_like:
+                    # Unlike
+                    db.session.delete(existing_like)
+                    StatsService.like_added(existing_like, -1)
+                    db.session.commit()
+                    invalidation_bus.bump('engagement')
+                    return {'liked': False, 'message': 'Like removed'}
+                else:
+                    # Like
+                    like = Like()
+                    like.user_id = user_id
+                    like.item_type = item_type
+                    like.item_id = item_id
+                    db.session.add(like)
+                    db.session.flush()
+                    StatsService.like_added(like)
+                    db.session.commit()
+                    invalidation_bus.bump('engagement')
+                    return {'liked': True, 'message': 'Like added'}
+            
+            return jsonify(write_queue.submit(apply_toggle))
+        except WriteQueueBusy:
+            return jsonify({'message': 'Server busy, please try again'}), 503, {'Retry-After': '1'}
         except Exception as e:
             return jsonify({'message': 'Failed to toggle like'}), 500
 
@@ -491,36 +663,11 @@ def admin_routes(app):
     @login_required
     def get_all_comments():
         try:
-            comments = Comment.query.order_by(Comment.created_at.desc()).all()
-            result = []
-            
-            for comment in comments:
-                comment_data = {
-                    'id': comment.id,
-                    'userId': comment.user_id,
-                    'authorName': comment.author_name,
-                    'authorEmail': comment.author_email,
-                    'itemType': comment.item_type,
-                    'itemId': comment.item_id,
-                    'content': comment.content,
-                    'parentId': comment.parent_id,
-                    'createdAt': comment.created_at.isoformat() if comment.created_at else None,
-                    'updatedAt': comment.updated_at.isoformat() if comment.updated_at else None
-                }
-                
-                # Add user info if available
-                if comment.user_id:
-                    user = User.query.get(comment.user_id)
-                    if user:
-                        comment_data['userInfo'] = {
-                            'firstName': user.first_name,
-                            'lastName': user.last_name,
-                            'email': user.email
-                        }
-                
-                result.append(comment_data)
-            
-            return jsonify(result)
+            return jsonify(comments_with_user_info(
+                COMMENT.select(COMMENT.parse_fields(request.args.get('fields'))).order_by(Comment.created_at.desc())
+            ))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch comments'}), 500
 
@@ -529,35 +676,11 @@ def admin_routes(app):
     def get_recent_comments():
         try:
             limit = int(request.args.get('limit', 10))
-            comments = Comment.query.order_by(Comment.created_at.desc()).limit(limit).all()
-            
-            result = []
-            for comment in comments:
-                comment_data = {
-                    'id': comment.id,
-                    'userId': comment.user_id,
-                    'authorName': comment.author_name,
-                    'authorEmail': comment.author_email,
-                    'itemType': comment.item_type,
-                    'itemId': comment.item_id,
-                    'content': comment.content,
-                    'parentId': comment.parent_id,
-                    'createdAt': comment.created_at.isoformat() if comment.created_at else None
-                }
-                
-                # Add user info if available
-                if comment.user_id:
-                    user = User.query.get(comment.user_id)
-                    if user:
-                        comment_data['userInfo'] = {
-                            'firstName': user.first_name,
-                            'lastName': user.last_name,
-                            'email': user.email
-                        }
-                
-                result.append(comment_data)
-            
-            return jsonify(result)
+            return jsonify(comments_with_user_info(
+                COMMENT.select(COMMENT.parse_fields(request.args.get('fields'))).order_by(Comment.created_at.desc()).limit(limit)
+            ))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch recent comments'}), 500
 
@@ -570,12 +693,68 @@ def admin_routes(app):
                 return jsonify({'message': 'Comment not found'}), 404
             
             db.session.delete(comment)
+            StatsService.comment_added(comment, -1)
             db.session.commit()
+            invalidation_bus.bump('comment', 'contact', 'engagement')
             
             return jsonify({'message': 'Comment deleted successfully'})
         except Exception as e:
             return jsonify({'message': 'Failed to delete comment'}), 500
 
+    # Admin Dashboard Routes
+    @app.route('/api/admin/stats', methods=['GET'])
+    @login_required
+    @admin_required
+    def get_admin_stats():
+        try:
+            days = min(int(request.args.get('days', 30)), 365)
+            top = min(int(request.args.get('top', 10)), 50)
+            if days < 1 or top < 1:
+                raise ValueError
+            return jsonify(StatsService.summary(days=days, top=top))
+        except ValueError:
+            return jsonify({'message': 'Invalid days or top parameter'}), 400
+        except Exception as e:
+            return jsonify({'message': 'Failed to fetch stats'}), 500
+
+    @app.route('/api/admin/timeseries', methods=['GET'])
+    @login_required
+    @admin_required
+    def get_timeseries():
+        try:
+            today = datetime.utcnow().date()
+            end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else today
+            start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else end - timedelta(days=89)
+            interval = request.args.get('interval', 'day')
+            if start > end or (end - start).days > MAX_TIMESERIES_DAYS or interval not in INTERVALS:
+                raise ValueError
+            return jsonify(rollups.timeseries(
+                start, end, interval,
+                item_type=request.args.get('itemType'),
+                item_id=request.args.get('itemId')
+            ))
+        except ValueError:
+            return jsonify({'message': f'Invalid range: from/to as YYYY-MM-DD, at most {MAX_TIMESERIES_DAYS} days, interval one of {", ".join(INTERVALS)}'}), 400
+        except Exception as e:
+            return jsonify({'message': 'Failed to fetch timeseries'}), 500
+
+    # Admin Monitoring Routes
+    @app.route('/api/admin/pool', methods=['GET'])
+    @login_required
+    @admin_required
+    def get_pool_stats():
+        return jsonify(pool_metrics.snapshot(app))
+
+    @app.route('/api/admin/slow-queries', methods=['GET'])
+    @login_required
+    @admin_required
+    def get_slow_queries():
+        try:
+            limit = int(request.args.get('limit', 20))
+            return jsonify(app.extensions['slow_query_log'].top_offenders(limit))
+        except Exception as e:
+            return jsonify({'message': 'Failed to read slow query log'}), 500
+
     # Admin Profile Routes
     @app.route('/api/admin/profile', methods=['PUT'])
     @login_required
@@ -603,19 +782,11 @@ def admin_routes(app):
             if 'heroImageUrl' in data:
                 user.hero_image_url = data['heroImageUrl']
             
-            user.updated_at = datetime.utcnow()
-            db.session.commit()
+            if db.session.is_modified(user):
+                user.updated_at = datetime.utcnow()
+                db.session.commit()
+                invalidation_bus.bump('profile')
             
-            return jsonify({
-                'id': user.id,
-                'email': user.email,
-                'firstName': user.first_name,
-                'lastName': user.last_name,
-                'profileImageUrl': user.profile_image_url,
-                'heroImageUrl': user.hero_image_url,
-                'linkedinUrl': user.linkedin_url,
-                'githubUrl': user.github_url,
-                'isAdmin': user.is_admin
-            })
+            return jsonify(USER.dump(user))
         except Exception as e:
             return jsonify({'message': 'Failed to update profile'}), 500
\ No newline at end of file
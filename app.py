@@ -2,12 +2,35 @@
 import os
 import sys
 import locale
+import threading
 from flask import Flask, request, jsonify, session, send_from_directory
 from flask_cors import CORS
 from flask_session import Session
 from werkzeug.utils import secure_filename
 from models import db, User, Project, Experience, Achievement, Like, Comment, File, Content
 from config import config
+from search_service import SearchService
+from technology_service import TechnologyService, parse_tech_filter
+from engagement_service import EngagementService
+from stats_service import StatsService
+from sqlite_profile import init_sqlite_profile
+from write_queue import init_write_queue, WriteQueueBusy
+from read_engine import init_read_engine
+from pool_metrics import instrument_engine
+from request_timing import init_request_timing, track_queries, add_server_timing
+from slow_query_log import init_slow_query_log
+from metrics import init_metrics
+from schema import init_schema
+from response_cache import init_response_cache
+from invalidation import init_invalidation_bus
+from static_export import init_static_export
+from snapshots import init_snapshots
+from rollups import init_rollups
+from serializers import (
+    InvalidFields, USER, PROJECT, EXPERIENCE, ACHIEVEMENT, COMMENT,
+    PROJECT_SUMMARY, EXPERIENCE_SUMMARY, ACHIEVEMENT_SUMMARY
+)
+import metrics
 from datetime import datetime, timedelta
 import uuid
 from typing import Optional, List
@@ -53,55 +76,44 @@ def create_app(config_name=None):
     app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
     app.config['JSON_SORT_KEYS'] = False
     
+    # Before any other before_request hook, so the request total includes them
+    init_request_timing(app)
+    
     # Initialize extensions
     db.init_app(app)
+    init_write_queue(app)
+    init_rollups(app)
+    init_response_cache(app)
+    init_invalidation_bus(app)
+    init_static_export(app)
+    init_snapshots(app)
     Session(app)
     CORS(app, supports_credentials=True)
+    init_slow_query_log(app)
+    init_metrics(app)
     
-    # Add UTF-8 headers to all responses
+    # Add UTF-8 and timing headers to all responses
     @app.after_request
     def after_request(response):
         response.headers['Content-Type'] = 'application/json; charset=utf-8' if response.is_json else response.headers.get('Content-Type', 'text/html; charset=utf-8')
+        if app.config.get('SERVER_TIMING_ENABLED', True):
+            add_server_timing(response)
         return response
     
-    # Initialize database and create admin user
     with app.app_context():
-        # Ensure proper encoding for database
-        if 'postgresql' in app.config['SQLALCHEMY_DATABASE_URI']:
-            # PostgreSQL should use UTF-8 by default, set connection encoding
-            try:
-                from sqlalchemy import text
-                with db.engine.connect() as conn:
-                    conn.execute(text("SET client_encoding TO 'UTF8'"))
-                    conn.commit()
-                print("PostgreSQL encoding set to UTF-8")
-            except Exception as e:
-                print(f"Database encoding setup: {e}")
-        elif 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
-            # For SQLite, ensure UTF-8 encoding
-            try:
-                from sqlalchemy import text
-                with db.engine.connect() as conn:
-                    conn.execute(text('PRAGMA encoding = "UTF-8"'))
-                    conn.commit()
-                print("SQLite encoding set to UTF-8")
-            except Exception as e:
-                print(f"SQLite encoding setup: {e}")
-        
-        db.create_all()
-        
-        # Create default admin user if none exists
-        admin = User.query.filter_by(is_admin=True).first()
-        if not admin:
-            admin = User()
-            admin.email = 'admin@example.com'
-            admin.password = 'admin123'  
-            admin.first_name = 'Admin'
-            admin.last_name = 'User'
-            admin.is_admin = True
-            db.session.add(admin)
-            db.session.commit()
-            print("Created default admin user: admin@example.com / admin123")
+        # Tune every SQLite connection before the first one is opened
+        init_sqlite_profile(app, db.engine)
+        instrument_engine(app, db.engine, 'primary')
+        track_queries(app, db.engine)
+    
+    # Schema creation and seeding run through `flask init-db` / `flask seed`;
+    # workers only check the schema marker file
+    init_schema(app)
+    
+    # Public GET traffic reads through its own read-only engine and pool
+    read_engine = init_read_engine(app, db)
+    if read_engine is not None:
+        track_queries(app, read_engine)
     
     # Register routes
     register_routes(app)
@@ -111,6 +123,11 @@ def create_app(config_name=None):
 def register_routes(app):
     """Register all application routes"""
     
+    write_queue = app.extensions['write_queue']
+    response_cache = app.extensions['response_cache']
+    invalidation_bus = app.extensions['invalidation_bus']
+    snapshots = app.extensions['snapshots']
+
     # Auth decorator
     def login_required(f):
         def decorated_function(*args, **kwargs):
@@ -133,91 +150,25 @@ def register_routes(app):
         decorated_function.__name__ = f.__name__
         return decorated_function
 
-    # Helper functions
-    def user_to_dict(user: User, exclude_password=True):
-        data = {
-            'id': user.id,
-            'email': user.email,
-            'firstName': user.first_name,
-            'lastName': user.last_name,
-            'profileImageUrl': user.profile_image_url,
-            'heroImageUrl': user.hero_image_url,
-            'linkedinUrl': user.linkedin_url,
-            'githubUrl': user.github_url,
-            'isAdmin': user.is_admin,
-            'createdAt': user.created_at.isoformat() if user.created_at else None,
-            'updatedAt': user.updated_at.isoformat() if user.updated_at else None
-        }
-        if not exclude_password:
-            data['password'] = user.password
-        return data
-
-    def project_to_dict(project: Project):
-        return {
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'imageUrl': project.image_url,
-            'githubUrl': project.github_url,
-            'liveUrl': project.live_url,
-            'technologies': project.technologies or [],
-            'featured': project.featured,
-            'published': project.published,
-            'linkedinPost': project.linkedin_post,
-            'linkedinPostUrl': project.linkedin_post_url,
-            'additionalImages': project.additional_images or [],
-            'createdAt': project.created_at.isoformat() if project.created_at else None,
-            'updatedAt': project.updated_at.isoformat() if project.updated_at else None
-        }
-
-    def experience_to_dict(experience: Experience):
-        return {
-            'id': experience.id,
-            'position': experience.position,
-            'company': experience.company,
-            'startDate': experience.start_date.isoformat() if experience.start_date else None,
-            'endDate': experience.end_date.isoformat() if experience.end_date else None,
-            'description': experience.description,
-            'technologies': experience.technologies or [],
-            'published': experience.published,
-            'linkedinPost': experience.linkedin_post,
-            'linkedinPostUrl': experience.linkedin_post_url,
-            'companyLogoUrl': experience.company_logo_url,
-            'additionalImages': experience.additional_images or [],
-            'createdAt': experience.created_at.isoformat() if experience.created_at else None,
-            'updatedAt': experience.updated_at.isoformat() if experience.updated_at else None
-        }
-
-    def achievement_to_dict(achievement: Achievement):
-        return {
-            'id': achievement.id,
-            'title': achievement.title,
-            'description': achievement.description,
-            'date': achievement.date.isoformat() if achievement.date else None,
-            'type': achievement.type,
-            'certificateUrl': achievement.certificate_url,
-            'published': achievement.published,
-            'linkedinPost': achievement.linkedin_post,
-            'linkedinPostUrl': achievement.linkedin_post_url,
-            'badgeImageUrl': achievement.badge_image_url,
-            'additionalImages': achievement.additional_images or [],
-            'createdAt': achievement.created_at.isoformat() if achievement.created_at else None,
-            'updatedAt': achievement.updated_at.isoformat() if achievement.updated_at else None
-        }
-
-    def comment_to_dict(comment: Comment):
-        return {
-            'id': comment.id,
-            'userId': comment.user_id,
-            'authorName': comment.author_name,
-            'authorEmail': comment.author_email,
-            'itemType': comment.item_type,
-            'itemId': comment.item_id,
-            'content': comment.content,
-            'parentId': comment.parent_id,
-            'createdAt': comment.created_at.isoformat() if comment.created_at else None,
-            'updatedAt': comment.updated_at.isoformat() if comment.updated_at else None
-        }
+    def wants_counts():
+        return request.args.get('counts') in ('1', 'true')
+
+    def list_serializer(full, summary):
+        """Lists ship the summary representation unless ?view=full is given"""
+        return full if request.args.get('view') == 'full' else summary
+
+    def contact_comments(comments):
+        """Add the display name of anonymous authors to serialized contact messages"""
+        for comment in comments:
+            if 'authorName' not in comment:
+                continue
+            name_parts = (comment['authorName'] or '').split(' ')
+            comment['user'] = {
+                'firstName': name_parts[0] if comment['authorName'] else 'Anônimo',
+                'lastName': ' '.join(name_parts[1:]),
+                'email': comment.get('authorEmail')
+            }
+        return comments
 
     # Auth routes
     @app.route('/api/login', methods=['POST'])
@@ -234,7 +185,7 @@ def register_routes(app):
             session['user_id'] = user.id
             return jsonify({
                 'message': 'Login successful',
-                'user': user_to_dict(user)
+                'user': USER.dump(user)
             })
         
         except Exception as e:
@@ -252,12 +203,15 @@ def register_routes(app):
             user = User.query.get(session['user_id'])
             if not user:
                 return jsonify({'message': 'User not found'}), 404
-            return jsonify(user_to_dict(user))
+            return jsonify(USER.dump(user, USER.parse_fields(request.args.get('fields'))))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch user'}), 500
 
     # Public routes
     @app.route('/api/profile', methods=['GET'])
+    @response_cache.cached('profile')
     def get_profile():
         try:
             admin = User.query.filter_by(is_admin=True).first()
@@ -277,90 +231,191 @@ def register_routes(app):
 
     # Projects routes
     @app.route('/api/projects', methods=['GET'])
+    @response_cache.cached('project')
     def get_projects():
         try:
-            projects = Project.query.filter_by(published=True).all()
-            return jsonify([project_to_dict(p) for p in projects])
+            serializer = list_serializer(PROJECT, PROJECT_SUMMARY)
+            query = serializer.select(serializer.parse_fields(request.args.get('fields'))).where(Project.published == True)
+            
+            tech = parse_tech_filter(request.args.get('tech'))
+            if tech:
+                query = query.where(Project.id.in_(TechnologyService.filter_ids('project', tech)))
+            
+            projects = serializer.fetch(query.order_by(Project.sort_order, Project.id))
+            if wants_counts():
+                EngagementService.embed_counts('project', projects)
+            return jsonify(projects)
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch projects'}), 500
 
     @app.route('/api/projects/featured', methods=['GET'])
+    @response_cache.cached('project')
     def get_featured_projects():
         try:
-            projects = Project.query.filter_by(published=True, featured=True).all()
-            return jsonify([project_to_dict(p) for p in projects])
+            serializer = list_serializer(PROJECT, PROJECT_SUMMARY)
+            fields = serializer.parse_fields(request.args.get('fields'))
+            projects = serializer.fetch(
+                serializer.select(fields)
+                .where(Project.published == True, Project.featured == True)
+                .order_by(Project.sort_order, Project.id)
+            )
+            if wants_counts():
+                EngagementService.embed_counts('project', projects)
+            return jsonify(projects)
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch featured projects'}), 500
 
     @app.route('/api/projects/<project_id>', methods=['GET'])
+    @response_cache.cached('project')
     def get_project(project_id):
         try:
-            project = Project.query.get(project_id)
-            if not project:
+            fields = PROJECT.parse_fields(request.args.get('fields'))
+            projects = PROJECT.fetch(PROJECT.select(fields).where(Project.id == project_id))
+            if not projects:
                 return jsonify({'message': 'Project not found'}), 404
             
-            return jsonify(project_to_dict(project))
+            return jsonify(projects[0])
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch project'}), 500
 
     # Experiences routes
     @app.route('/api/experiences', methods=['GET'])
+    @response_cache.cached('experience')
     def get_experiences():
         try:
-            experiences = Experience.query.filter_by(published=True).all()
-            return jsonify([experience_to_dict(e) for e in experiences])
+            serializer = list_serializer(EXPERIENCE, EXPERIENCE_SUMMARY)
+            query = serializer.select(serializer.parse_fields(request.args.get('fields'))).where(Experience.published == True)
+            
+            tech = parse_tech_filter(request.args.get('tech'))
+            if tech:
+                query = query.where(Experience.id.in_(TechnologyService.filter_ids('experience', tech)))
+            
+            experiences = serializer.fetch(query.order_by(Experience.sort_order, Experience.id))
+            if wants_counts():
+                EngagementService.embed_counts('experience', experiences)
+            return jsonify(experiences)
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch experiences'}), 500
 
+    @app.route('/api/experiences/<experience_id>', methods=['GET'])
+    @response_cache.cached('experience')
+    def get_experience(experience_id):
+        try:
+            fields = EXPERIENCE.parse_fields(request.args.get('fields'))
+            experiences = EXPERIENCE.fetch(EXPERIENCE.select(fields).where(Experience.id == experience_id, Experience.published == True))
+            if not experiences:
+                return jsonify({'message': 'Experience not found'}), 404
+            
+            return jsonify(experiences[0])
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
+        except Exception as e:
+            return jsonify({'message': 'Failed to fetch experience'}), 500
+
+    # Technologies routes
+    @app.route('/api/technologies', methods=['GET'])
+    @response_cache.cached('project', 'experience')
+    def get_technologies():
+        try:
+            item_type = request.args.get('type')
+            if item_type and item_type not in ('project', 'experience'):
+                return jsonify({'message': 'Invalid type'}), 400
+            
+            return jsonify(TechnologyService.usage(item_type))
+        except Exception as e:
+            return jsonify({'message': 'Failed to fetch technologies'}), 500
+
     # Achievements routes
     @app.route('/api/achievements', methods=['GET'])
+    @response_cache.cached('achievement')
     def get_achievements():
         try:
-            achievements = Achievement.query.filter_by(published=True).all()
-            return jsonify([achievement_to_dict(a) for a in achievements])
+            serializer = list_serializer(ACHIEVEMENT, ACHIEVEMENT_SUMMARY)
+            fields = serializer.parse_fields(request.args.get('fields'))
+            achievements = serializer.fetch(
+                serializer.select(fields).where(Achievement.published == True).order_by(Achievement.sort_order, Achievement.id)
+            )
+            if wants_counts():
+                EngagementService.embed_counts('achievement', achievements)
+            return jsonify(achievements)
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'Failed to fetch achievements'}), 500
 
+    @app.route('/api/achievements/<achievement_id>', methods=['GET'])
+    @response_cache.cached('achievement')
+    def get_achievement(achievement_id):
+        try:
+            fields = ACHIEVEMENT.parse_fields(request.args.get('fields'))
+            achievements = ACHIEVEMENT.fetch(ACHIEVEMENT.select(fields).where(Achievement.id == achievement_id, Achievement.published == True))
+            if not achievements:
+                return jsonify({'message': 'Achievement not found'}), 404
+            
+            return jsonify(achievements[0])
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
+        except Exception as e:
+            return jsonify({'message': 'Failed to fetch achievement'}), 500
+
+    # Search routes
+    @app.route('/api/search', methods=['GET'])
+    @response_cache.cached('project', 'experience', 'achievement')
+    def search():
+        try:
+            query = request.args.get('q', '').strip()
+            item_type = request.args.get('type')
+            page = int(request.args.get('page', 1))
+            per_page = int(request.args.get('perPage', 10))
+            
+            if item_type and item_type not in ('project', 'experience', 'achievement'):
+                return jsonify({'message': 'Invalid type'}), 400
+            
+            return jsonify(SearchService.search(query, item_type=item_type, page=page, per_page=per_page))
+        except ValueError:
+            return jsonify({'message': 'Invalid pagination parameters'}), 400
+        except Exception as e:
+            print(f"Error searching content: {e}")
+            return jsonify({'message': 'Failed to search'}), 500
+
     # Contact comments routes
     @app.route('/api/contact/comments', methods=['GET'])
+    @response_cache.cached('contact')
     def get_contact_comments():
         try:
             limit = int(request.args.get('limit', 5))
-            comments = Comment.query.filter_by(item_type='contact').order_by(Comment.created_at.desc()).limit(limit).all()
-            
-            formatted_comments = []
-            for comment in comments:
-                formatted_comment = comment_to_dict(comment)
-                # Add user info for anonymous comments
-                formatted_comment['user'] = {
-                    'firstName': comment.author_name.split(' ')[0] if comment.author_name else 'Anônimo',
-                    'lastName': ' '.join(comment.author_name.split(' ')[1:]) if comment.author_name and len(comment.author_name.split(' ')) > 1 else '',
-                    'email': comment.author_email
-                }
-                formatted_comments.append(formatted_comment)
-            
-            return jsonify(formatted_comments)
+            fields = COMMENT.parse_fields(request.args.get('fields'))
+            comments = COMMENT.fetch(
+                COMMENT.select(fields).where(Comment.item_type == 'contact').order_by(Comment.created_at.desc()).limit(limit)
+            )
+            
+            return jsonify(contact_comments(comments))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             print(f"Error fetching contact comments: {e}")
             return jsonify({'message': 'Failed to fetch comments'}), 500
 
     @app.route('/api/contact/comments/all', methods=['GET'])
+    @response_cache.cached('contact')
     def get_all_contact_comments():
         try:
-            comments = Comment.query.filter_by(item_type='contact').order_by(Comment.created_at.desc()).all()
-            
-            formatted_comments = []
-            for comment in comments:
-                formatted_comment = comment_to_dict(comment)
-                # Add user info for anonymous comments
-                formatted_comment['user'] = {
-                    'firstName': comment.author_name.split(' ')[0] if comment.author_name else 'Anônimo',
-                    'lastName': ' '.join(comment.author_name.split(' ')[1:]) if comment.author_name and len(comment.author_name.split(' ')) > 1 else '',
-                    'email': comment.author_email
-                }
-                formatted_comments.append(formatted_comment)
-            
-            return jsonify(formatted_comments)
+            fields = COMMENT.parse_fields(request.args.get('fields'))
+            comments = COMMENT.fetch(
+                COMMENT.select(fields).where(Comment.item_type == 'contact').order_by(Comment.created_at.desc())
+            )
+            
+            return jsonify(contact_comments(comments))
+        except InvalidFields as e:
+            return jsonify({'message': str(e)}), 400
         except Exception as e:
             print(f"Error fetching all contact comments: {e}")
             return jsonify({'message': 'Failed to fetch all comments'}), 500
@@ -379,20 +434,28 @@ def register_routes(app):
                 return jsonify({'message': 'All fields are required'}), 400
             
             # Create comment for contact form submission
-            comment = Comment()
-            comment.author_name = name
-            comment.author_email = email
-            comment.item_type = 'contact'
-            comment.item_id = 'general'
-            comment.content = f"**Assunto:** {subject}\n\n{message}"
-            
-            db.session.add(comment)
-            db.session.commit()
+            def save_contact():
+                comment = Comment()
+                comment.author_name = name
+                comment.author_email = email
+                comment.item_type = 'contact'
+                comment.item_id = 'general'
+                comment.content = f"**Assunto:** {subject}\n\n{message}"
+                
+                db.session.add(comment)
+                db.session.flush()
+                StatsService.comment_added(comment)
+                db.session.commit()
+            
+            write_queue.submit(save_contact)
+            invalidation_bus.bump('contact')
             
             # Log the contact form submission
             print(f"Contact form submission: {name} ({email}) - {subject}: {message}")
             
             return jsonify({'message': 'Message sent successfully'})
+        except WriteQueueBusy:
+            return jsonify({'message': 'Server busy, please try again'}), 503, {'Retry-After': '1'}
         except Exception as e:
             print(f"Error saving contact comment: {e}")
             return jsonify({'message': 'Failed to send message'}), 500
@@ -434,6 +497,7 @@ def register_routes(app):
                 db.session.add(new_content)
             
             db.session.commit()
+            invalidation_bus.bump('content')
             return jsonify({'message': 'Content updated successfully'})
             
         except Exception as e:
@@ -447,6 +511,7 @@ def register_routes(app):
             return jsonify({'message': 'Failed to update content'}), 500
 
     @app.route('/api/content', methods=['GET'])
+    @response_cache.cached('content')
     def get_content():
         try:
             content_items = Content.query.all()
@@ -481,6 +546,8 @@ def register_routes(app):
             user_id = session['user_id']
             
             file_info = UploadService.save_file(file, user_id)
+            metrics.inc('uploads_total')
+            metrics.inc('upload_bytes_total', file_info['size'])
             return jsonify(file_info)
             
         except ValueError as e:
@@ -504,14 +571,29 @@ def register_routes(app):
         # Serve static files from dist/public
         if path and os.path.exists(os.path.join("dist/public", path)):
             return send_from_directory("dist/public", path)
-        else:
-            # Serve index.html for all other routes (React Router)
-            return send_from_directory("dist/public", "index.html")
+        
+        # Crawlers get pre-rendered HTML of the page instead of the empty shell
+        snapshot = snapshots.serve(path)
+        if snapshot is not None:
+            return snapshot
+        
+        # Serve index.html for all other routes (React Router)
+        return send_from_directory("dist/public", "index.html")
+
+_app_lock = threading.Lock()
+
 
-# Create application instance
-app = create_app()
+def __getattr__(name):
+    # The module-level `app` (wsgi.py, main.py, `flask --app app`) is created on first
+    # access, so entry points that call create_app() themselves build only one application
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _app_lock:
+        if 'app' not in globals():
+            globals()['app'] = create_app()
+    return globals()['app']
 
 if __name__ == '__main__':
     # Run the application
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
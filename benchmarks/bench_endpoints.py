@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Benchmark every route of app.py and admin_routes.py against a seeded database.
+
+Reports p50/p95/p99 latency, SQL queries per request (from the Server-Timing header)
+and peak allocated KiB per request (tracemalloc, measured in a separate pass).
+
+Usage: python benchmarks/bench_endpoints.py [--iterations N] [--seed N] [--projects N] ...
+                                      [--only endpoint,...] [--json results.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PNG_BYTES = (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00'
+             b'\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\xff\xff?\x00\x05\xfe\x02\xfe\xa7\x35\x81\x84'
+             b'\x00\x00\x00\x00IEND\xaeB`\x82')
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def scenarios(ids):
+    """(endpoint, method, path, request kwargs, setup) for every route.
+
+    setup, when given, runs untimed before each request and returns values for the path.
+    """
+    project = ids['projects'][0]
+    experience = ids['experiences'][0]
+    achievement = ids['achievements'][0]
+    hot_item = ids['hot_item']
+
+    def new_row(model_name):
+        def setup(i):
+            from models import db, Project, Experience, Achievement, Comment
+            model = {'project': Project, 'experience': Experience, 'achievement': Achievement, 'comment': Comment}[model_name]
+            fields = {
+                'project': {'title': 'tmp', 'description': 'tmp'},
+                'experience': {'position': 'tmp', 'company': 'tmp', 'start_date': datetime(2024, 1, 1), 'description': 'tmp'},
+                'achievement': {'title': 'tmp', 'description': 'tmp', 'date': datetime(2024, 1, 1), 'type': 'award'},
+                'comment': {'item_type': 'project', 'item_id': project, 'content': 'tmp'},
+            }[model_name]
+            row = model(**fields)
+            db.session.add(row)
+            db.session.commit()
+            return {'id': row.id}
+        return setup
+
+    experience_payload = {'position': 'Dev', 'company': 'Bench', 'startDate': '2024-01-01T00:00:00Z', 'description': 'x'}
+    achievement_payload = {'title': 'Bench', 'description': 'x', 'date': '2024-01-01T00:00:00Z', 'type': 'award'}
+
+    return [
+        ('login', 'POST', '/api/login', {'json': {'email': 'admin@example.com', 'password': 'admin123'}}, None),
+        ('get_current_user', 'GET', '/api/auth/user', {}, None),
+        ('get_profile', 'GET', '/api/profile', {}, None),
+        ('get_projects', 'GET', '/api/projects', {}, None),
+        ('get_projects?counts', 'GET', '/api/projects?counts=1', {}, None),
+        ('get_projects?tech', 'GET', '/api/projects?tech=react,python', {}, None),
+        ('get_projects?fields', 'GET', '/api/projects?fields=title,imageUrl,technologies', {}, None),
+        ('get_featured_projects', 'GET', '/api/projects/featured', {}, None),
+        ('get_project', 'GET', f'/api/projects/{project}', {}, None),
+        ('get_experiences', 'GET', '/api/experiences', {}, None),
+        ('get_experience', 'GET', f'/api/experiences/{experience}', {}, None),
+        ('get_technologies', 'GET', '/api/technologies', {}, None),
+        ('get_achievements', 'GET', '/api/achievements', {}, None),
+        ('get_achievement', 'GET', f'/api/achievements/{achievement}', {}, None),
+        ('search', 'GET', '/api/search?q=dados', {}, None),
+        ('get_contact_comments', 'GET', '/api/contact/comments', {}, None),
+        ('get_all_contact_comments', 'GET', '/api/contact/comments/all', {}, None),
+        ('contact', 'POST', '/api/contact', {'json': {'name': 'Bench', 'email': 'b@example.com', 'subject': 's', 'message': 'm'}}, None),
+        ('update_content', 'POST', '/api/content', {'json': {'section': 'hero', 'field': 'title', 'content': 'Bench'}}, None),
+        ('get_content', 'GET', '/api/content', {}, None),
+        ('get_all_projects', 'GET', '/api/admin/projects', {}, None),
+        ('create_project', 'POST', '/api/projects', {'json': {'title': 'Bench', 'description': 'x', 'technologies': ['React']}}, None),
+        ('update_project', 'PUT', f'/api/projects/{project}', {'json': {'title': 'Bench project'}}, None),
+        ('delete_project', 'DELETE', '/api/projects/{id}', {}, new_row('project')),
+        ('bulk_projects', 'POST', '/api/admin/projects/bulk', {'json': {'operations': [
+            {'op': 'update', 'id': item_id, 'data': {'published': True}} for item_id in ids['projects'][:20]
+        ]}}, None),
+        ('reorder_projects', 'PUT', '/api/admin/projects/order', {'json': {'ids': ids['projects'][::-1]}}, None),
+        ('get_all_experiences', 'GET', '/api/admin/experiences', {}, None),
+        ('create_experience', 'POST', '/api/experiences', {'json': experience_payload}, None),
+        ('update_experience', 'PUT', f'/api/experiences/{experience}', {'json': {'company': 'Bench Inc'}}, None),
+        ('delete_experience', 'DELETE', '/api/experiences/{id}', {}, new_row('experience')),
+        ('bulk_experiences', 'POST', '/api/admin/experiences/bulk', {'json': {'operations': [
+            {'op': 'update', 'id': item_id, 'data': {'published': True}} for item_id in ids['experiences'][:20]
+        ]}}, None),
+        ('reorder_experiences', 'PUT', '/api/admin/experiences/order', {'json': {'ids': ids['experiences'][::-1]}}, None),
+        ('get_all_achievements', 'GET', '/api/admin/achievements', {}, None),
+        ('create_achievement', 'POST', '/api/achievements', {'json': achievement_payload}, None),
+        ('update_achievement', 'PUT', f'/api/achievements/{achievement}', {'json': {'title': 'Bench award'}}, None),
+        ('delete_achievement', 'DELETE', '/api/achievements/{id}', {}, new_row('achievement')),
+        ('bulk_achievements', 'POST', '/api/admin/achievements/bulk', {'json': {'operations': [
+            {'op': 'update', 'id': item_id, 'data': {'published': True}} for item_id in ids['achievements'][:20]
+        ]}}, None),
+        ('reorder_achievements', 'PUT', '/api/admin/achievements/order', {'json': {'ids': ids['achievements'][::-1]}}, None),
+        ('get_comments', 'GET', f'/api/comments/project/{hot_item}', {}, None),
+        ('get_comments?threaded', 'GET', f'/api/comments/project/{hot_item}?threaded=1', {}, None),
+        ('create_comment', 'POST', '/api/comments', {'json': {'itemType': 'project', 'itemId': project, 'content': 'Bench'}}, None),
+        ('toggle_like', 'POST', '/api/likes', {'json': {'itemType': 'project', 'itemId': project}}, None),
+        ('get_likes', 'GET', f'/api/likes/project/{hot_item}', {}, None),
+        ('get_all_comments', 'GET', '/api/admin/comments', {}, None),
+        ('get_recent_comments', 'GET', '/api/admin/comments/recent', {}, None),
+        ('delete_comment', 'DELETE', '/api/admin/comments/{id}', {}, new_row('comment')),
+        ('get_admin_stats', 'GET', '/api/admin/stats', {}, None),
+        ('get_timeseries', 'GET', '/api/admin/timeseries?interval=month&from=2025-01-01', {}, None),
+        ('get_pool_stats', 'GET', '/api/admin/pool', {}, None),
+        ('get_slow_queries', 'GET', '/api/admin/slow-queries', {}, None),
+        ('update_admin_profile', 'PUT', '/api/admin/profile', {'json': {'firstName': 'Admin'}}, None),
+        ('upload_file', 'POST', '/api/upload', {'upload': True}, None),
+        ('uploaded_file', 'GET', '/static/bench.png', {}, None),
+        ('serve_frontend', 'GET', '/projects', {}, None),
+        ('metrics', 'GET', '/metrics', {}, None),
+        ('logout', 'POST', '/api/logout', {}, None),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def send(client, method, path, kwargs):
+    kwargs = dict(kwargs)
+    if kwargs.pop('upload', False):
+        kwargs['data'] = {'file': (io.BytesIO(PNG_BYTES), 'bench.png')}
+        kwargs['content_type'] = 'multipart/form-data'
+    return client.open(path, method=method, **kwargs)
+
+
+def run_scenario(app, client, scenario, iterations, alloc_iterations):
+    from models import db
+    endpoint, method, path, kwargs, setup = scenario
+
+    def prepare(i):
+        if setup is None:
+            return path
+        with app.app_context():
+            values = setup(i)
+            db.session.remove()
+        return path.format(**values)
+
+    # Warm-up
+    send(client, method, prepare(-1), kwargs)
+    if endpoint == 'logout':
+        send(client, 'POST', '/api/login', {'json': {'email': 'admin@example.com', 'password': 'admin123'}})
+
+    latencies = []
+    queries = []
+    statuses = set()
+    for i in range(iterations):
+        url = prepare(i)
+        start = time.perf_counter()
+        response = send(client, method, url, kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses.add(response.status_code)
+        match = QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+        if match:
+            queries.append(int(match.group(1)))
+        if endpoint == 'logout':
+            send(client, 'POST', '/api/login', {'json': {'email': 'admin@example.com', 'password': 'admin123'}})
+
+    allocations = []
+    for i in range(alloc_iterations):
+        url = prepare(i)
+        tracemalloc.start()
+        send(client, method, url, kwargs)
+        allocations.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+        if endpoint == 'logout':
+            send(client, 'POST', '/api/login', {'json': {'email': 'admin@example.com', 'password': 'admin123'}})
+
+    return {
+        'method': method,
+        'path': path,
+        'status': sorted(statuses),
+        'iterations': iterations,
+        'p50Ms': round(percentile(latencies, 50), 3),
+        'p95Ms': round(percentile(latencies, 95), 3),
+        'p99Ms': round(percentile(latencies, 99), 3),
+        'meanMs': round(sum(latencies) / len(latencies), 3),
+        'queriesPerRequest': round(sum(queries) / len(queries), 2) if queries else None,
+        'peakAllocKiB': round(sum(allocations) / len(allocations), 1) if allocations else None,
+    }
+
+
+# Smaller than generate_data.py's defaults so a full run stays under a minute
+BENCH_VOLUMES = {
+    'users': 50,
+    'projects': 50,
+    'experiences': 20,
+    'achievements': 30,
+    'comments': 500,
+    'likes': 2000,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--alloc-iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', help='Comma separated scenario names to run')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache on (measures cache hits)')
+    parser.add_argument('--hot-skew', type=float, default=1.1, help='Zipf exponent for likes/comments per item')
+    for name, default in BENCH_VOLUMES.items():
+        parser.add_argument(f'--{name}', type=int, default=default)
+    args = parser.parse_args()
+    volumes = {name: getattr(args, name) for name in BENCH_VOLUMES}
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.chdir(workdir)
+    os.environ['FLASK_ENV'] = 'production'
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['SLOW_QUERY_LOG_FILE'] = os.path.join(workdir, 'logs', 'slow_queries.log')
+    os.environ['METRICS_DIR'] = os.path.join(workdir, 'metrics')
+    os.environ['RESPONSE_CACHE_ENABLED'] = '1' if args.cache else '0'
+
+    import app as app_module
+    from generate_data import DataGenerator
+    from models import db, Project, Experience, Achievement
+    from schema import init_db, seed_admin
+
+    app = app_module.app
+    app.config['SESSION_COOKIE_SECURE'] = False
+    app.config['UPLOAD_FOLDER'] = os.path.join(workdir, 'static')
+
+    with app.app_context():
+        init_db(app)
+        seed_admin()
+        generator = DataGenerator(seed=args.seed, hot_skew=args.hot_skew, log=lambda message: None)
+        ids = generator.generate(volumes)
+        # Scenarios address published rows only
+        ids['projects'] = [row.id for row in Project.query.filter_by(published=True).order_by(Project.id)]
+        ids['experiences'] = [row.id for row in Experience.query.filter_by(published=True).order_by(Experience.id)]
+        ids['achievements'] = [row.id for row in Achievement.query.filter_by(published=True).order_by(Achievement.id)]
+        # The project with the most comments drives the comment and like scenarios
+        from models import Comment
+        ids['hot_item'] = db.session.query(Comment.item_id).filter_by(item_type='project').group_by(
+            Comment.item_id).order_by(db.func.count().desc()).limit(1).scalar() or ids['projects'][0]
+
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'bench.png'), 'wb') as f:
+        f.write(PNG_BYTES)
+
+    client = app.test_client()
+    send(client, 'POST', '/api/login', {'json': {'email': 'admin@example.com', 'password': 'admin123'}})
+
+    selected = set(args.only.split(',')) if args.only else None
+    all_scenarios = scenarios(ids)
+    covered = {s[0].split('?')[0] for s in all_scenarios}
+    missing = sorted({rule.endpoint for rule in app.url_map.iter_rules()} - covered - {'static'})
+    if missing:
+        print(f"Warning: routes without a scenario: {', '.join(missing)}")
+
+    results = {}
+    for scenario in all_scenarios:
+        if selected and scenario[0] not in selected:
+            continue
+        results[scenario[0]] = run_scenario(app, client, scenario, args.iterations, args.alloc_iterations)
+
+    print(f"{'endpoint':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'KiB':>9}  status")
+    for name, r in results.items():
+        print(f"{name:<28}{r['p50Ms']:>9}{r['p95Ms']:>9}{r['p99Ms']:>9}"
+              f"{r['queriesPerRequest'] if r['queriesPerRequest'] is not None else '-':>9}"
+              f"{r['peakAllocKiB'] if r['peakAllocKiB'] is not None else '-':>9}  {r['status']}")
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'revision': git_revision(),
+                    'timestamp': datetime.utcnow().isoformat(),
+                    'python': platform.python_version(),
+                    'seed': args.seed,
+                    'volumes': volumes,
+                    'iterations': args.iterations,
+                },
+                'endpoints': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite read/write throughput for each profile in Config.SQLITE_PROFILES.
+
+Usage: python benchmarks/bench_sqlite_profile.py [--writes N] [--reads N] [--threads N] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, text
+from config import Config
+from sqlite_profile import apply_pragmas
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", connect_args={'check_same_thread': False})
+    if pragmas:
+        event.listen(engine, 'connect', lambda conn, record: apply_pragmas(conn, pragmas))
+    return engine
+
+
+def run_threads(threads, target, total):
+    per_thread = total // threads
+    workers = [threading.Thread(target=target, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def bench_profile(name, pragmas, writes, reads, threads):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, 'bench.db'), pragmas)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE likes (id VARCHAR(36) PRIMARY KEY, item_type VARCHAR(50), "
+                "item_id VARCHAR(36), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            ))
+            conn.execute(text("CREATE INDEX ix_likes_item ON likes (item_type, item_id)"))
+        
+        errors = []
+        
+        # One transaction per write, like a toggle_like request
+        def writer(count):
+            for i in range(count):
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            text("INSERT INTO likes (id, item_type, item_id) VALUES (:id, 'project', :item)"),
+                            {'id': str(uuid.uuid4()), 'item': f"p{i % 50}"}
+                        )
+                except Exception as e:
+                    errors.append(str(e))
+        
+        def reader(count):
+            for i in range(count):
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT count(*) FROM likes WHERE item_type = 'project' AND item_id = :item"),
+                        {'item': f"p{i % 50}"}
+                    ).scalar()
+        
+        write_rate = run_threads(threads, writer, writes)
+        read_rate = run_threads(threads, reader, reads)
+        engine.dispose()
+    
+    return {
+        'profile': name,
+        'pragmas': pragmas,
+        'writesPerSecond': round(write_rate, 1),
+        'readsPerSecond': round(read_rate, 1),
+        'writeErrors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writes', type=int, default=2000)
+    parser.add_argument('--reads', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    results = [
+        bench_profile(name, pragmas, args.writes, args.reads, args.threads)
+        for name, pragmas in Config.SQLITE_PROFILES.items()
+    ]
+    
+    print(f"{'profile':<14}{'writes/s':>12}{'reads/s':>12}{'errors':>8}")
+    for r in results:
+        print(f"{r['profile']:<14}{r['writesPerSecond']:>12}{r['readsPerSecond']:>12}{r['writeErrors']:>8}")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measure worker cold start: time to import app.py and build its application in a fresh
+interpreter, and the SQL statements it runs before serving the first request.
+
+Scenarios:
+  ready      - schema marker present, what a gunicorn/PythonAnywhere worker does
+  auto-init  - no marker and AUTO_INIT_DB=1, the development fallback
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter
+CHILD = """
+import json, sys, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+statements = []
+event.listen(Engine, 'before_cursor_execute', lambda *args: statements.append(args[2].split(None, 1)[0].upper()))
+
+started = time.perf_counter()
+import app
+apps = []
+_create_app = app.create_app
+app.create_app = lambda *args, **kwargs: apps.append(1) or _create_app(*args, **kwargs)
+app.app
+elapsed = time.perf_counter() - started
+sys.stdout.flush()
+print('RESULT ' + json.dumps({'seconds': elapsed, 'statements': statements, 'apps': len(apps)}))
+"""
+
+
+def run_child(env, workdir):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    line = next(line for line in output.splitlines() if line.startswith('RESULT '))
+    return json.loads(line[len('RESULT '):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-startup-')
+    env = {
+        **os.environ,
+        'PYTHONPATH': ROOT,
+        'FLASK_ENV': 'production',
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        'SLOW_QUERY_LOG_FILE': os.path.join(workdir, 'logs', 'slow_queries.log'),
+        'METRICS_DIR': os.path.join(workdir, 'metrics'),
+        'SCHEMA_MARKER_FILE': os.path.join(workdir, '.schema_version'),
+    }
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=workdir, env=env,
+                   check=True, capture_output=True)
+
+    scenarios = {
+        'ready': ({}, False),
+        'auto-init': ({'AUTO_INIT_DB': '1'}, True),
+    }
+    results = {}
+    print(f"{'scenario':<12} {'median ms':>10} {'min ms':>10} {'apps':>5} {'statements':>11}  kinds")
+    for name, (extra_env, remove_marker) in scenarios.items():
+        timings = []
+        statements = []
+        for _ in range(args.runs):
+            if remove_marker and os.path.exists(env['SCHEMA_MARKER_FILE']):
+                os.remove(env['SCHEMA_MARKER_FILE'])
+            result = run_child({**env, **extra_env}, workdir)
+            timings.append(result['seconds'] * 1000)
+            statements = result['statements']
+            apps = result['apps']
+        kinds = sorted(set(statements))
+        results[name] = {
+            'medianMs': round(statistics.median(timings), 1),
+            'minMs': round(min(timings), 1),
+            'appsBuilt': apps,
+            'statements': len(statements),
+            'statementKinds': kinds,
+        }
+        print(f"{name:<12} {results[name]['medianMs']:>10} {results[name]['minMs']:>10} {apps:>5} "
+              f"{len(statements):>11}  {', '.join(kinds) or '-'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'python': sys.version.split()[0], 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
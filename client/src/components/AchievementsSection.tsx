@@ -7,7 +7,7 @@ import { useMutation, useQueryClient } from "@tanstack/react-query";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
 import { useLocation } from "wouter";
-import type { Achievement } from "@shared/schema";
+import type { AchievementSummary } from "@shared/schema";
 
 interface AchievementsSectionProps {
   onOpenComments: (type: string, id: string) => void;
@@ -46,7 +46,7 @@ export default function AchievementsSection({ onOpenComments, onOpenAchievementM
   const { toast } = useToast();
   const [, setLocation] = useLocation();
 
-  const { data: achievements = [], isLoading } = useQuery<Achievement[]>({
+  const { data: achievements = [], isLoading } = useQuery<AchievementSummary[]>({
     queryKey: ["/api/achievements"],
   });
 
@@ -81,8 +81,8 @@ export default function AchievementsSection({ onOpenComments, onOpenAchievementM
     likeMutation.mutate({ itemId: achievementId });
   };
 
-  const handleShare = async (achievement: Achievement) => {
-    const text = `Confira esta conquista: ${achievement.title} - ${achievement.description}`;
+  const handleShare = async (achievement: AchievementSummary) => {
+    const text = `Confira esta conquista: ${achievement.title} - ${achievement.excerpt}`;
     if (navigator.share) {
       try {
         await navigator.share({
@@ -212,7 +212,7 @@ export default function AchievementsSection({ onOpenComments, onOpenAchievementM
                         </div>
                       </div>
                       <p className="text-slate-600 mb-3" data-testid={`text-achievement-description-${index}`}>
-                        {achievement.description}
+                        {achievement.excerpt}
                       </p>
                       <div className="flex items-center text-sm text-slate-500 mb-4">
                         <CalendarDays className="w-4 h-4 mr-1" />
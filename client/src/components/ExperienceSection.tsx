@@ -5,7 +5,7 @@ import { Button } from "@/components/ui/button";
 import { CalendarDays, Eye, Plus } from "lucide-react";
 import { useLocation } from "wouter";
 import { useAuth } from "@/hooks/useAuth";
-import type { Experience } from "@shared/schema";
+import type { ExperienceSummary } from "@shared/schema";
 
 interface ExperienceSectionProps {
   onOpenExperienceModal?: () => void;
@@ -15,7 +15,7 @@ export default function ExperienceSection({ onOpenExperienceModal }: ExperienceS
   const [, setLocation] = useLocation();
   const { user } = useAuth();
   
-  const { data: experiences = [], isLoading } = useQuery<Experience[]>({
+  const { data: experiences = [], isLoading } = useQuery<ExperienceSummary[]>({
     queryKey: ["/api/experiences"],
   });
 
@@ -106,7 +106,7 @@ export default function ExperienceSection({ onOpenExperienceModal }: ExperienceS
                       </div>
                       
                       <p className="text-slate-600 mb-4" data-testid={`text-description-${index}`}>
-                        {experience.description}
+                        {experience.excerpt}
                       </p>
                       
                       {experience.technologies && experience.technologies.length > 0 && (
@@ -8,7 +8,7 @@ import { useMutation, useQueryClient } from "@tanstack/react-query";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
 import { useLocation } from "wouter";
-import type { Project } from "@shared/schema";
+import type { ProjectSummary } from "@shared/schema";
 
 interface ProjectsSectionProps {
   onOpenComments: (type: string, id: string) => void;
@@ -21,7 +21,7 @@ export default function ProjectsSection({ onOpenComments, onOpenProjectModal }:
   const { toast } = useToast();
   const [, setLocation] = useLocation();
 
-  const { data: projects = [], isLoading } = useQuery<Project[]>({
+  const { data: projects = [], isLoading } = useQuery<ProjectSummary[]>({
     queryKey: ["/api/projects"],
   });
 
@@ -56,13 +56,13 @@ export default function ProjectsSection({ onOpenComments, onOpenProjectModal }:
     likeMutation.mutate({ itemId: projectId });
   };
 
-  const handleShare = async (project: Project) => {
+  const handleShare = async (project: ProjectSummary) => {
     const url = `${window.location.origin}/project/${project.id}`;
     if (navigator.share) {
       try {
         await navigator.share({
           title: project.title,
-          text: project.description,
+          text: project.excerpt,
           url,
         });
       } catch (error) {
@@ -179,7 +179,7 @@ export default function ProjectsSection({ onOpenComments, onOpenProjectModal }:
                 </div>
                 
                 <p className="text-slate-600 mb-4" data-testid={`text-project-description-${project.id}`}>
-                  {project.description}
+                  {project.excerpt}
                 </p>
                 
                 {project.technologies && (
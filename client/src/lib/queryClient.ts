@@ -7,6 +7,35 @@ async function throwIfResNotOk(res: Response) {
   }
 }
 
+// Public data exported by `flask export-static`: API path -> fingerprinted JSON file.
+// Used only while the server keeps the export current after writes (`live`), and
+// revalidated every MANIFEST_TTL_MS so long-lived tabs pick up re-exports.
+// After this tab writes anything it reads the live API, which reflects the write
+// before the debounced re-export does.
+const MANIFEST_TTL_MS = 60_000;
+let staticFiles: Promise<Record<string, string>> | null = null;
+let manifestLoadedAt = 0;
+let preferLiveApi = false;
+
+function loadStaticFiles(): Promise<Record<string, string>> {
+  if (!staticFiles || Date.now() - manifestLoadedAt > MANIFEST_TTL_MS) {
+    manifestLoadedAt = Date.now();
+    staticFiles = fetch("/data/manifest.json", { cache: "no-cache" })
+      .then((res) => (res.ok ? res.json() : {}))
+      .then((manifest) => (manifest.live ? manifest.files ?? {} : {}))
+      .catch(() => ({}));
+  }
+  return staticFiles;
+}
+
+async function resolveUrl(url: string): Promise<string> {
+  if (preferLiveApi) {
+    return url;
+  }
+  const files = await loadStaticFiles();
+  return files[url] ?? url;
+}
+
 export async function apiRequest(
   method: string,
   url: string,
@@ -22,6 +51,10 @@ export async function apiRequest(
     credentials: "include",
   });
 
+  if (method !== "GET") {
+    preferLiveApi = true;
+  }
+
   await throwIfResNotOk(res);
   return res;
 }
@@ -32,7 +65,7 @@ export const getQueryFn: <T>(options: {
 }) => QueryFunction<T> =
   ({ on401: unauthorizedBehavior }) =>
   async ({ queryKey }) => {
-    const res = await fetch(queryKey.join("/") as string, {
+    const res = await fetch(await resolveUrl(queryKey.join("/") as string), {
       credentials: "include",
     });
 
@@ -3,7 +3,7 @@ import { Link } from "wouter";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { ArrowLeft, CalendarDays, Eye, Award, Trophy, GraduationCap, Medal } from "lucide-react";
-import type { Achievement } from "@shared/schema";
+import type { AchievementSummary } from "@shared/schema";
 
 const getIconForType = (type: string) => {
   switch (type.toLowerCase()) {
@@ -32,7 +32,7 @@ const getColorForType = (type: string) => {
 };
 
 export default function AllAchievements() {
-  const { data: achievements = [], isLoading } = useQuery<Achievement[]>({
+  const { data: achievements = [], isLoading } = useQuery<AchievementSummary[]>({
     queryKey: ["/api/achievements"],
   });
 
@@ -99,7 +99,7 @@ export default function AllAchievements() {
                         {achievement.title}
                       </h3>
                       <p className="text-slate-600 mb-3">
-                        {achievement.description}
+                        {achievement.excerpt}
                       </p>
                       <div className="flex items-center text-sm text-slate-500 mb-4">
                         <CalendarDays className="w-4 h-4 mr-1" />
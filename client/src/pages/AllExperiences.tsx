@@ -4,10 +4,10 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { ArrowLeft, CalendarDays, Eye } from "lucide-react";
-import type { Experience } from "@shared/schema";
+import type { ExperienceSummary } from "@shared/schema";
 
 export default function AllExperiences() {
-  const { data: experiences = [], isLoading } = useQuery<Experience[]>({
+  const { data: experiences = [], isLoading } = useQuery<ExperienceSummary[]>({
     queryKey: ["/api/experiences"],
   });
 
@@ -88,7 +88,7 @@ export default function AllExperiences() {
                       </div>
                       
                       <p className="text-slate-600 mb-4">
-                        {experience.description}
+                        {experience.excerpt}
                       </p>
                       
                       {experience.technologies && experience.technologies.length > 0 && (
@@ -4,10 +4,10 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { ArrowLeft, Github, ExternalLink, Eye } from "lucide-react";
-import type { Project } from "@shared/schema";
+import type { ProjectSummary } from "@shared/schema";
 
 export default function AllProjects() {
-  const { data: projects = [], isLoading } = useQuery<Project[]>({
+  const { data: projects = [], isLoading } = useQuery<ProjectSummary[]>({
     queryKey: ["/api/projects"],
   });
 
@@ -67,7 +67,7 @@ export default function AllProjects() {
                 </h3>
                 
                 <p className="text-slate-600 mb-4">
-                  {project.description}
+                  {project.excerpt}
                 </p>
                 
                 {project.technologies && (
@@ -1,5 +1,41 @@
 import os
 from pathlib import Path
+from pool_metrics import InstrumentedQueuePool
+
+# Connection pool sizing per deployment profile (DB_POOL_PROFILE).
+# DB_POOL_SIZE, DB_MAX_OVERFLOW and DB_POOL_TIMEOUT override single values.
+POOL_PROFILES = {
+    'small': {'pool_size': 2, 'max_overflow': 2, 'pool_timeout': 10},  # PythonAnywhere / single worker
+    'default': {'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 30},
+    'large': {'pool_size': 20, 'max_overflow': 20, 'pool_timeout': 30},
+}
+
+def engine_options(database_uri, pool_profile='default'):
+    """Build SQLAlchemy engine options for a database URI and pool profile"""
+    options = {
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+        'echo': False,  # Disable SQL logging to avoid encoding issues
+    }
+    
+    if database_uri.startswith('sqlite'):
+        options['connect_args'] = {'check_same_thread': False}
+        if ':memory:' in database_uri or database_uri in ('sqlite://', 'sqlite:///'):
+            # In-memory databases live in a single connection, no pool to size
+            return options
+    elif database_uri.startswith('postgresql'):
+        # Database engine options with proper UTF-8 support
+        options['client_encoding'] = 'utf8'
+        options['connect_args'] = {'options': '-c client_encoding=UTF8'}
+    
+    profile = POOL_PROFILES[os.environ.get('DB_POOL_PROFILE', pool_profile)]
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', profile['pool_size'])),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', profile['max_overflow'])),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', profile['pool_timeout'])),
+    })
+    return options
 
 class Config:
     """Base configuration class"""
@@ -13,11 +49,91 @@ class Config:
     
     # Database configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(os.environ.get('DATABASE_URL', ''))
+    
+    # Tables are created by `flask init-db`, which writes this marker. Workers only
+    # read the marker at boot; AUTO_INIT_DB runs init-db and seed there instead.
+    SCHEMA_MARKER_FILE = os.environ.get('SCHEMA_MARKER_FILE', '.schema_version')
+    AUTO_INIT_DB = os.environ.get('AUTO_INIT_DB') == '1'
+    
+    # Read-only engine used by public GET requests. Unset, SQLite opens the primary
+    # file in read-only mode and other backends read from the primary.
+    SQLALCHEMY_READ_DATABASE_URI = os.environ.get('READ_DATABASE_URL')
+    SQLALCHEMY_READ_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('READ_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('READ_POOL_MAX_OVERFLOW', 10)),
+        'pool_timeout': 10,
         'pool_pre_ping': True,
         'pool_recycle': 300,
-        'echo': False,  # Disable SQL logging to avoid encoding issues
+        'poolclass': InstrumentedQueuePool,
     }
+    # With a replica, a client's reads go to the primary for this long after its own
+    # writes, so a like or comment shows up in the refetch that follows it (0 disables)
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))
+    
+    # SQLite performance profile, applied to every pooled connection.
+    # 'default' leaves SQLite's built-in settings untouched.
+    SQLITE_PROFILES = {
+        'default': {},
+        'performance': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -16000,  # Negative means KiB, ~16MB per connection
+            'mmap_size': 64 * 1024 * 1024,
+            'busy_timeout': 5000,  # ms to wait for a lock before "database is locked"
+            'temp_store': 'MEMORY',
+        },
+    }
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'performance')
+    SQLITE_WAL_CHECKPOINT_INTERVAL = int(os.environ.get('SQLITE_WAL_CHECKPOINT_INTERVAL', 300))  # seconds, 0 disables
+    SQLITE_WAL_CHECKPOINT_MODE = 'PASSIVE'
+    
+    # Serialized writes for likes, comments and contact messages.
+    # None enables the writer thread only for SQLite.
+    WRITE_QUEUE_ENABLED = None
+    WRITE_QUEUE_MAXSIZE = int(os.environ.get('WRITE_QUEUE_MAXSIZE', 256))
+    WRITE_QUEUE_TIMEOUT = float(os.environ.get('WRITE_QUEUE_TIMEOUT', 10))  # seconds
+    
+    # Rendered responses of public GET endpoints, per URL and ?fields= set. Writes
+    # invalidate them in every worker through INVALIDATION_FILE; the TTL is a backstop.
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', '1') == '1'
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = 512
+    INVALIDATION_FILE = os.environ.get('INVALIDATION_FILE', 'cache_versions.bin')  # Memory-mapped tag versions
+    
+    # Public API rendered to fingerprinted JSON (dist/public/data) for a static web
+    # server. `flask export-static` writes it; once it exists, writes re-export it.
+    # Disabled, the manifest tells clients to use the live API instead.
+    STATIC_EXPORT_ENABLED = os.environ.get('STATIC_EXPORT_ENABLED', '1') == '1'
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR', 'dist/public')
+    STATIC_EXPORT_DEBOUNCE = 2.0  # seconds after the last write
+    
+    # Pre-rendered HTML of the public pages served to crawlers and link previews
+    # (dist/public/snapshots). Rendered on first request and again after writes.
+    SNAPSHOTS_ENABLED = os.environ.get('SNAPSHOTS_ENABLED', '1') == '1'
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', 'dist/public/snapshots')
+    SITE_URL = os.environ.get('SITE_URL', '')  # Absolute URLs in og:url / og:image, e.g. https://example.com
+    
+    # Daily engagement rollups for /api/admin/timeseries, compacted by a background
+    # thread per worker (0 disables it; `flask compact-rollups` runs it from cron)
+    ROLLUP_INTERVAL = int(os.environ.get('ROLLUP_INTERVAL', 300))  # seconds
+    ROLLUP_LAG = 60  # seconds; newer rows wait for the next run
+    
+    # Per-request Server-Timing header (total, DB, query count, serialization)
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', '1') == '1'
+    
+    # Slow query log: statements over the threshold go to a rotating JSON-lines file
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE', 'logs/slow_queries.log')
+    SLOW_QUERY_LOG_MAX_BYTES = 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS = 3
+    
+    # Prometheus metrics. Each worker flushes its counters to METRICS_DIR and /metrics
+    # merges them; files of exited workers are folded into metrics_archive.json.
+    # Clear the directory on deploy to reset the counters.
+    METRICS_DIR = os.environ.get('METRICS_DIR', './metrics')
+    METRICS_FLUSH_INTERVAL = 5.0  # seconds
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token for scrapers; otherwise admins only
     
     # Session configuration
     SESSION_TYPE = 'filesystem'
@@ -45,20 +161,9 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///portfolio_dev.db'
     SESSION_COOKIE_SECURE = False
+    AUTO_INIT_DB = os.environ.get('AUTO_INIT_DB', '1') == '1'
     
-    # Database engine options with proper UTF-8 support
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-        'echo': False,
-        'client_encoding': 'utf8',
-        'connect_args': {
-            'check_same_thread': False,
-            'options': '-c timezone=UTC'
-        } if 'sqlite' in (os.environ.get('DATABASE_URL') or 'sqlite:///portfolio_dev.db') else {
-            'options': '-c client_encoding=UTF8'
-        }
-    }
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
 
 class ProductionConfig(Config):
     """Production configuration for PythonAnywhere"""
@@ -73,18 +178,14 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SAMESITE = 'Strict'
     
     # Database specific engine options with UTF-8 support
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-        'echo': False,
-        'connect_args': {
-            'check_same_thread': False,
-        }
-    }
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
 
 class PythonAnywhereConfig(ProductionConfig):
     """Specific configuration for PythonAnywhere deployment"""
     
+    # Few threads per worker, keep the pool small
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(ProductionConfig.SQLALCHEMY_DATABASE_URI, 'small')
+    
     # PythonAnywhere specific paths
     def __init__(self):
         super().__init__()
@@ -0,0 +1,30 @@
+from sqlalchemy import func, literal, union_all
+from models import db, Like, Comment
+
+
+class EngagementService:
+    @staticmethod
+    def counts(item_type: str, item_ids: list) -> dict:
+        """Like and comment counts for many items with one grouped aggregate query"""
+        if not item_ids:
+            return {}
+        
+        likes = db.select(
+            Like.item_id, literal('like').label('kind'), func.count().label('total')
+        ).where(Like.item_type == item_type, Like.item_id.in_(item_ids)).group_by(Like.item_id)
+        comments = db.select(
+            Comment.item_id, literal('comment').label('kind'), func.count().label('total')
+        ).where(Comment.item_type == item_type, Comment.item_id.in_(item_ids)).group_by(Comment.item_id)
+        
+        result = {item_id: {'likeCount': 0, 'commentCount': 0} for item_id in item_ids}
+        for item_id, kind, total in db.session.execute(union_all(likes, comments)):
+            result[item_id]['likeCount' if kind == 'like' else 'commentCount'] = total
+        return result
+
+    @staticmethod
+    def embed_counts(item_type: str, items: list) -> list:
+        """Add likeCount/commentCount to serialized items in place"""
+        counts = EngagementService.counts(item_type, [item['id'] for item in items])
+        for item in items:
+            item.update(counts[item['id']])
+        return items
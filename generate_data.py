@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Script to generate a large, deterministic synthetic dataset for scale testing.
+
+The same seed and options always produce the same rows. Rows are bulk-inserted in
+batches into the database configured for the app (DATABASE_URL / FLASK_ENV).
+
+Usage: python generate_data.py --comments 50000 --likes 300000 [--seed 42] [--reset]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+
+TECHNOLOGIES = ['React', 'TypeScript', 'Flask', 'Python', 'SQLite', 'PostgreSQL', 'Docker',
+                'Node.js', 'Tailwind', 'Vite', 'Redis', 'AWS', 'Go', 'Rust', 'Vue', 'Kotlin',
+                'GraphQL', 'Django', 'FastAPI', 'Kubernetes', 'Terraform', 'Next.js', 'MySQL']
+WORDS = ('sistema portfólio dados api cliente servidor desempenho cache consulta banco interface '
+         'usuário projeto equipe entrega produto teste deploy nuvem mobile aplicação integração '
+         'arquitetura migração segurança análise automação código revisão métricas escala').split()
+
+DEFAULT_VOLUMES = {
+    'users': 2000,
+    'projects': 200,
+    'experiences': 40,
+    'achievements': 120,
+    'comments': 20000,
+    'likes': 100000,
+}
+
+
+def _id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _post(rng, words):
+    """LinkedIn-style post: a few paragraphs with hashtags"""
+    length = rng.randint(words // 2, words * 2)
+    paragraphs = [_text(rng, n) for n in _split(rng, length, rng.randint(2, 6))]
+    hashtags = ' '.join(f"#{rng.choice(TECHNOLOGIES).replace('.', '')}" for _ in range(3))
+    return '\n\n'.join(paragraphs + [hashtags])
+
+
+def _split(rng, total, parts):
+    cuts = sorted(rng.sample(range(1, total), parts - 1)) if total > parts else []
+    return [b - a for a, b in zip([0] + cuts, cuts + [total])] or [total]
+
+
+def _with_excerpts(rows):
+    from serializers import make_excerpt
+    for row in rows:
+        row['excerpt'] = make_excerpt(row['description'])
+        yield row
+
+
+def _zipf_weights(count, skew):
+    """Cumulative weights where item k gets 1 / k^skew of the traffic (skew 0 = uniform)"""
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+class DataGenerator:
+    def __init__(self, seed=42, hot_skew=1.1, reply_probability=0.35, max_reply_depth=4,
+                 post_words=250, max_images=6, days=365, batch_size=5000, log=print):
+        self.rng = random.Random(seed)
+        self.hot_skew = hot_skew
+        self.reply_probability = reply_probability
+        self.max_reply_depth = max_reply_depth
+        self.post_words = post_words
+        self.max_images = max_images
+        self.days = days
+        self.batch_size = batch_size
+        self.log = log
+        self.end = datetime(2025, 1, 1)
+        self.start = self.end - timedelta(days=days)
+
+    def _timestamp(self):
+        return self.start + timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def _images(self, prefix):
+        return [f'/static/{prefix}-{self.rng.randrange(10 ** 6)}.jpg' for _ in range(self.rng.randint(0, self.max_images))]
+
+    def users(self, count):
+        rng = self.rng
+        for i in range(count):
+            created = self._timestamp()
+            yield {
+                'id': _id(rng), 'email': f'user{i}@example.com', 'password': 'generated',
+                'first_name': f'Usuário{i}', 'last_name': rng.choice(['Silva', 'Souza', 'Lima', 'Costa']),
+                'is_admin': False, 'created_at': created, 'updated_at': created
+            }
+
+    def projects(self, count):
+        rng = self.rng
+        for i in range(count):
+            created = self._timestamp()
+            yield {
+                'id': _id(rng), 'title': _text(rng, rng.randint(2, 6)), 'description': _text(rng, rng.randint(30, 150)),
+                'image_url': f'/static/project-{i}.jpg', 'github_url': f'https://github.com/example/project-{i}',
+                'live_url': None, 'technologies': rng.sample(TECHNOLOGIES, rng.randint(1, 8)),
+                'featured': rng.random() < 0.15, 'published': rng.random() < 0.9,
+                'linkedin_post': _post(rng, self.post_words), 'linkedin_post_url': None,
+                'additional_images': self._images('project'), 'sort_order': i, 'created_at': created, 'updated_at': created
+            }
+
+    def experiences(self, count):
+        rng = self.rng
+        for i in range(count):
+            start_date = self._timestamp() - timedelta(days=365 * rng.randint(0, 10))
+            yield {
+                'id': _id(rng), 'position': _text(rng, 2), 'company': f'Empresa {i}',
+                'start_date': start_date,
+                'end_date': None if rng.random() < 0.1 else start_date + timedelta(days=rng.randint(90, 1500)),
+                'description': _text(rng, rng.randint(30, 120)), 'technologies': rng.sample(TECHNOLOGIES, rng.randint(1, 6)),
+                'published': rng.random() < 0.9, 'linkedin_post': _post(rng, self.post_words),
+                'company_logo_url': f'/static/logo-{i}.png', 'additional_images': self._images('experience'),
+                'sort_order': i, 'created_at': start_date, 'updated_at': start_date
+            }
+
+    def achievements(self, count):
+        rng = self.rng
+        for i in range(count):
+            date = self._timestamp()
+            yield {
+                'id': _id(rng), 'title': _text(rng, rng.randint(2, 5)), 'description': _text(rng, rng.randint(20, 80)),
+                'date': date, 'type': rng.choice(['certification', 'award', 'speaking', 'course']),
+                'certificate_url': None, 'published': rng.random() < 0.9,
+                'linkedin_post': _post(rng, self.post_words), 'badge_image_url': f'/static/badge-{i}.png',
+                'additional_images': self._images('achievement'), 'sort_order': i, 'created_at': date, 'updated_at': date
+            }
+
+    def comments(self, count, items, user_ids):
+        """Comments concentrated on hot items, with reply chains up to max_reply_depth"""
+        rng = self.rng
+        weights = _zipf_weights(len(items), self.hot_skew)
+        # Recent comments per item that can still receive replies: (id, depth)
+        open_threads = {}
+        timestamps = sorted(self._timestamp() for _ in range(count))
+        for i, created in enumerate(timestamps):
+            item_type, item_id = rng.choices(items, cum_weights=weights)[0]
+            candidates = open_threads.setdefault(item_id, [])
+            parent_id, depth = None, 0
+            if candidates and rng.random() < self.reply_probability:
+                parent_id, parent_depth = rng.choice(candidates[-20:])
+                depth = parent_depth + 1
+            comment_id = _id(rng)
+            if depth < self.max_reply_depth:
+                candidates.append((comment_id, depth))
+
+            anonymous = rng.random() < 0.6
+            yield {
+                'id': comment_id, 'user_id': None if anonymous else rng.choice(user_ids),
+                'author_name': f'Visitante {i}' if anonymous else None,
+                'author_email': f'visitante{i}@example.com' if anonymous else None,
+                'item_type': item_type, 'item_id': item_id, 'content': _text(rng, rng.randint(5, 60)),
+                'parent_id': parent_id, 'created_at': created, 'updated_at': created
+            }
+
+    def likes(self, count, items, user_ids):
+        """Unique (user, item) likes, concentrated on hot items"""
+        rng = self.rng
+        weights = _zipf_weights(len(items), self.hot_skew)
+        count = min(count, len(items) * len(user_ids))
+        seen = set()
+        attempts = 0
+        while len(seen) < count and attempts < count * 20:
+            attempts += 1
+            user_id = rng.choice(user_ids)
+            item_type, item_id = rng.choices(items, cum_weights=weights)[0]
+            if (user_id, item_id) in seen:
+                continue
+            seen.add((user_id, item_id))
+            yield {
+                'id': _id(rng), 'user_id': user_id, 'item_type': item_type,
+                'item_id': item_id, 'created_at': self._timestamp()
+            }
+
+    def contacts(self, count):
+        rng = self.rng
+        for i in range(count):
+            created = self._timestamp()
+            yield {
+                'id': _id(rng), 'author_name': f'Contato {i}', 'author_email': f'contato{i}@example.com',
+                'item_type': 'contact', 'item_id': 'general',
+                'content': f"**Assunto:** {_text(rng, 4)}\n\n{_text(rng, rng.randint(10, 80))}",
+                'created_at': created, 'updated_at': created
+            }
+
+    def load(self, model, rows):
+        """Bulk insert rows in batches and return their ids"""
+        from models import db
+
+        ids = []
+        batch = []
+        started = time.perf_counter()
+        for row in rows:
+            batch.append(row)
+            ids.append(row['id'])
+            if len(batch) >= self.batch_size:
+                db.session.execute(db.insert(model), batch)
+                db.session.commit()
+                batch = []
+        if batch:
+            db.session.execute(db.insert(model), batch)
+            db.session.commit()
+        self.log(f"  {model.__tablename__}: {len(ids)} rows in {time.perf_counter() - started:.2f}s")
+        return ids
+
+    def generate(self, volumes=None) -> dict:
+        """Generate and load every table. Must run inside an app context"""
+        from models import User, Project, Experience, Achievement, Like, Comment
+        from search_service import SearchService
+        from technology_service import TechnologyService
+        from stats_service import StatsService
+
+        volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+        ids = {
+            'users': self.load(User, self.users(volumes['users'])),
+            'projects': self.load(Project, _with_excerpts(self.projects(volumes['projects']))),
+            'experiences': self.load(Experience, _with_excerpts(self.experiences(volumes['experiences']))),
+            'achievements': self.load(Achievement, _with_excerpts(self.achievements(volumes['achievements']))),
+        }
+        items = [('project', i) for i in ids['projects']] + [('achievement', i) for i in ids['achievements']]
+        if items:
+            ids['comments'] = self.load(Comment, self.comments(volumes['comments'], items, ids['users'] or [None]))
+            if ids['users']:
+                ids['likes'] = self.load(Like, self.likes(volumes['likes'], items, ids['users']))
+        ids['contacts'] = self.load(Comment, self.contacts(volumes.get('contacts', volumes['comments'] // 50)))
+
+        started = time.perf_counter()
+        SearchService.rebuild()
+        TechnologyService.rebuild()
+        StatsService.rebuild()
+        # Generated rows are backdated behind the rollup watermark
+        current_app.extensions['rollups'].rebuild()
+        self.log(f"  indexes rebuilt in {time.perf_counter() - started:.2f}s")
+        return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--contacts', type=int, help='Contact messages (default: comments / 50)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--hot-skew', type=float, default=1.1,
+                        help='Zipf exponent for likes/comments per item; 0 is uniform, higher is hotter')
+    parser.add_argument('--reply-probability', type=float, default=0.35)
+    parser.add_argument('--max-reply-depth', type=int, default=4)
+    parser.add_argument('--post-words', type=int, default=250, help='Typical linkedin_post length in words')
+    parser.add_argument('--max-images', type=int, default=6, help='Maximum additional_images per item')
+    parser.add_argument('--days', type=int, default=365, help='Spread timestamps over this many days')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--database-url', help='Override DATABASE_URL for this run')
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate all tables first')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    from app import app
+    from models import db
+    from schema import init_db, seed_admin
+
+    volumes = {name: getattr(args, name) for name in DEFAULT_VOLUMES}
+    if args.contacts is not None:
+        volumes['contacts'] = args.contacts
+
+    generator = DataGenerator(
+        seed=args.seed, hot_skew=args.hot_skew, reply_probability=args.reply_probability,
+        max_reply_depth=args.max_reply_depth, post_words=args.post_words, max_images=args.max_images,
+        days=args.days, batch_size=args.batch_size
+    )
+
+    with app.app_context():
+        if args.reset:
+            print("Recreating tables...")
+            db.drop_all()
+            db.session.execute(db.text("DROP TABLE IF EXISTS search_index"))
+            db.session.commit()
+        init_db(app)
+        seed_admin()
+
+        print(f"Generating data (seed {args.seed})...")
+        started = time.perf_counter()
+        generator.generate(volumes)
+        print(f"Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
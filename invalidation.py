@@ -0,0 +1,108 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from flask import request
+
+# One 8-byte version counter per tag; new tags take the next free slot
+TAGS = ('project', 'experience', 'achievement', 'comment', 'contact', 'engagement', 'content', 'profile')
+SLOTS = 32
+_FORMAT = f'<{SLOTS}Q'
+_SIZE = struct.calcsize(_FORMAT)
+
+
+class InvalidationBus:
+    """Cache invalidation shared by every worker process through a memory-mapped file.
+
+    bump() increments the version of some tags under an exclusive file lock. Each
+    worker compares the versions with the ones it last saw in poll(), once per
+    request, and calls its subscribers with the tags that changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._subscribers = []
+        self._local_subscribers = []
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._map = None
+        self._seen = self.versions()
+
+    def _mapping(self):
+        # Reopened after fork: flock locks belong to the open file, which a forked child shares
+        if self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            f = open(self.path, 'a+b')
+            if os.fstat(f.fileno()).st_size < _SIZE:
+                f.truncate(_SIZE)
+            self._file = f
+            self._map = mmap.mmap(f.fileno(), _SIZE)
+            self._pid = os.getpid()
+        return self._map
+
+    def versions(self) -> tuple:
+        return struct.unpack_from(_FORMAT, self._mapping())
+
+    def subscribe(self, callback, local_only=False):
+        """Register callback(*tags), called when those tags change in any process,
+        or only for bumps made by this process with local_only
+        """
+        (self._local_subscribers if local_only else self._subscribers).append(callback)
+
+    def _notify(self, tags, local=False):
+        for callback in self._subscribers:
+            callback(*tags)
+        if local:
+            for callback in self._local_subscribers:
+                callback(*tags)
+
+    def bump(self, *tags):
+        """Invalidate tags in this process now and in the other workers on their next request"""
+        slots = [TAGS.index(tag) for tag in tags]
+        with self._lock:
+            mapping = self._mapping()
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                for slot in slots:
+                    offset = slot * 8
+                    struct.pack_into('<Q', mapping, offset, struct.unpack_from('<Q', mapping, offset)[0] + 1)
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            # Our own bump needs no second notification from poll()
+            seen = list(self._seen)
+            for slot in slots:
+                seen[slot] += 1
+            self._seen = tuple(seen)
+        self._notify(tags, local=True)
+
+    def poll(self):
+        """Notify subscribers of tags bumped since the last poll"""
+        versions = self.versions()
+        if versions == self._seen:
+            return
+        with self._lock:
+            changed = [tag for i, tag in enumerate(TAGS) if versions[i] != self._seen[i]]
+            self._seen = versions
+        if changed:
+            self._notify(changed)
+
+
+def init_invalidation_bus(app):
+    """Share cache invalidations between workers and keep the response cache coherent"""
+    bus = InvalidationBus(app.config.get('INVALIDATION_FILE', 'cache_versions.bin'))
+    app.extensions['invalidation_bus'] = bus
+
+    response_cache = app.extensions.get('response_cache')
+    if response_cache is not None:
+        bus.subscribe(response_cache.invalidate)
+
+    @app.before_request
+    def poll_invalidations():
+        if request.method == 'GET':
+            bus.poll()
+
+    return bus
@@ -0,0 +1,396 @@
+import atexit
+import fcntl
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from flask import g, request, session, Response
+import pool_metrics
+from pool_metrics import WAIT_BUCKETS
+
+# Upper bounds (seconds) for request and query latency histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# name -> (type, help)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by endpoint, method and status'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by endpoint and status'),
+    'db_queries_total': ('counter', 'SQL statements executed'),
+    'db_query_duration_seconds': ('histogram', 'SQL statement latency'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result (hit/miss)'),
+    'upload_bytes_total': ('counter', 'Bytes received through file uploads'),
+    'uploads_total': ('counter', 'Files received through uploads'),
+    'session_store_operations_total': ('counter', 'Session store operations by operation'),
+    'session_store_duration_seconds': ('histogram', 'Session store operation latency'),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool'),
+    'db_pool_checkout_wait_seconds': ('histogram', 'Time spent waiting for a pooled connection'),
+    'db_pool_timeouts_total': ('counter', 'Checkouts that timed out on an exhausted pool'),
+    'db_pool_pre_ping_failures_total': ('counter', 'Pooled connections found dead by pre-ping'),
+    'db_pool_connections_in_use': ('gauge', 'Connections currently checked out, per process'),
+    'write_queue_pending': ('gauge', 'Writes waiting for the SQLite writer thread, per process'),
+}
+
+# Counters and histograms of workers that have exited, folded together by MetricsExporter
+ARCHIVE_FILE = 'metrics_archive.json'
+
+BUCKETS = {
+    'http_request_duration_seconds': LATENCY_BUCKETS,
+    'db_query_duration_seconds': QUERY_BUCKETS,
+    'session_store_duration_seconds': QUERY_BUCKETS,
+}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Thread-safe in-process counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        buckets = BUCKETS[name]
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += value
+            histogram[2] += 1
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                'counters': [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, dict(labels), list(h[0]), h[1], h[2]] for (name, labels), h in self._histograms.items()],
+            }
+
+
+registry = MetricsRegistry()
+inc = registry.inc
+observe = registry.observe
+
+
+def _pool_state(app):
+    """Pool and write queue figures of this process in the same shape as registry.state()"""
+    pid = str(os.getpid())
+    state = {'counters': [], 'histograms': [], 'gauges': []}
+    for engine, stats in pool_metrics.snapshot(app).items():
+        labels = {'engine': engine}
+        state['counters'] += [
+            ['db_pool_checkouts_total', labels, stats['checkouts']],
+            ['db_pool_timeouts_total', labels, stats['timeouts']],
+            ['db_pool_pre_ping_failures_total', labels, stats['prePingFailures']],
+        ]
+        state['histograms'].append([
+            'db_pool_checkout_wait_seconds', labels,
+            [stats['checkoutWaitBuckets'][str(bound)] for bound in WAIT_BUCKETS],
+            stats['checkoutWaitTotalMs'] / 1000, stats['checkouts']
+        ])
+        state['gauges'].append(['db_pool_connections_in_use', {'engine': engine, 'pid': pid}, stats['checkedOut']])
+
+    write_queue = app.extensions.get('write_queue')
+    if write_queue is not None and write_queue.enabled:
+        state['gauges'].append(['write_queue_pending', {'pid': pid}, write_queue.pending()])
+    return state
+
+
+def _process_start(pid):
+    """Start time of a running process in clock ticks since boot, or None (not running, no /proc)"""
+    try:
+        with open(f'/proc/{pid}/stat', encoding='utf-8') as f:
+            # Field 22; the command name in field 2 may contain spaces, so count after it
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_process = (None, None)
+
+
+def _process_id():
+    """Identifies this process across pid reuse: pid plus start time (a random id without /proc)"""
+    global _process
+    pid = os.getpid()
+    if _process[0] != pid:
+        start = _process_start(pid)
+        _process = (pid, f'{pid}-{start if start is not None else uuid.uuid4().hex}')
+    return _process[1]
+
+
+def _process_alive(state):
+    pid = state.get('pid')
+    if not pid:
+        return False
+    start = _process_start(pid)
+    if start is not None:
+        # A new process that reused the pid has another start time
+        return state.get('process') == f'{pid}-{start}'
+    return _pid_alive(pid)
+
+
+def _merge(states):
+    """Sum counters and histograms across process states"""
+    counters = {}
+    histograms = {}
+    for state in states:
+        for name, labels, value in state['counters']:
+            key = _key(name, labels)
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in state['histograms']:
+            key = _key(name, labels)
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+    return counters, histograms
+
+
+class MetricsExporter:
+    """Shares each worker's metrics through per-process files and renders the merged view.
+
+    Files are named after the pid and start time of their process, so a worker that
+    reuses a pid never overwrites another's counters. Files of workers that have
+    exited are folded into ARCHIVE_FILE and removed, keeping their totals.
+    """
+
+    def __init__(self, app, directory, flush_interval=5.0):
+        self.app = app
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def process_state(self) -> dict:
+        state = registry.state()
+        pool = _pool_state(self.app)
+        state['counters'] += pool['counters']
+        state['histograms'] += pool['histograms']
+        state['gauges'] = pool['gauges']
+        state['pid'] = os.getpid()
+        state['process'] = _process_id()
+        return state
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            path = os.path.join(self.directory, f'metrics_{_process_id()}.json')
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.process_state(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to flush metrics: {e}")
+        finally:
+            self._flush_lock.release()
+
+    def _read(self, filename):
+        try:
+            with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _archive(self, filename, state):
+        """Fold the counters of an exited worker into the archive and remove its file"""
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+            # One worker at a time, so a file is never archived twice
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            path = os.path.join(self.directory, filename)
+            if not os.path.exists(path):
+                return
+            archive = self._read(ARCHIVE_FILE) or {'processes': [], 'counters': [], 'histograms': []}
+            counters, histograms = _merge([archive, state])
+            archive = {
+                # Archived but possibly not yet removed: readers skip these files
+                'processes': [
+                    process for process in archive['processes']
+                    if os.path.exists(os.path.join(self.directory, f'metrics_{process}.json'))
+                ] + [state.get('process')],
+                'counters': [[name, dict(labels), value] for (name, labels), value in counters.items()],
+                'histograms': [[name, dict(labels), *histogram] for (name, labels), histogram in histograms.items()],
+            }
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            with open(f'{archive_path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(archive, f)
+            os.replace(f'{archive_path}.tmp', archive_path)
+            os.remove(path)
+
+    def collect(self) -> list:
+        """Latest state of every process; this one is read live instead of from its file"""
+        own_file = f'metrics_{_process_id()}.json'
+        states = {}
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.json') and filename != own_file:
+                state = self._read(filename)
+                if state is not None:
+                    states[filename] = state
+
+        for filename, state in list(states.items()):
+            if filename == ARCHIVE_FILE or _process_alive(state):
+                continue
+            try:
+                self._archive(filename, state)
+                states[ARCHIVE_FILE] = self._read(ARCHIVE_FILE)
+                del states[filename]
+            except OSError as e:
+                # Counters of finished workers still count, their gauges don't
+                state['gauges'] = []
+                print(f"Failed to archive metrics of {filename}: {e}")
+
+        archived = set((states.get(ARCHIVE_FILE) or {}).get('processes', []))
+        return [self.process_state()] + [
+            state for filename, state in states.items()
+            if state is not None and (filename == ARCHIVE_FILE or state.get('process') not in archived)
+        ]
+
+    def render(self) -> str:
+        states = self.collect()
+        counters, histograms = _merge(states)
+        gauges = {}
+        for state in states:
+            for name, labels, value in state.get('gauges', []):
+                gauges[_key(name, labels)] = value
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'histogram':
+                bounds = WAIT_BUCKETS if name == 'db_pool_checkout_wait_seconds' else BUCKETS[name]
+                for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket in zip(bounds, buckets):
+                        cumulative += bucket
+                        lines.append(f'{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+                    lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {count}')
+                    lines.append(f'{name}_sum{_labels(labels)} {total}')
+                    lines.append(f'{name}_count{_labels(labels)} {count}')
+            else:
+                values = counters if kind == 'counter' else gauges
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class InstrumentedSessionInterface:
+    """Wraps a session interface to count and time session store reads and writes"""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def open_session(self, app, request):
+        start = time.perf_counter()
+        try:
+            return self.inner.open_session(app, request)
+        finally:
+            inc('session_store_operations_total', operation='open')
+            observe('session_store_duration_seconds', time.perf_counter() - start, operation='open')
+
+    def save_session(self, app, session, response):
+        start = time.perf_counter()
+        try:
+            return self.inner.save_session(app, session, response)
+        finally:
+            inc('session_store_operations_total', operation='save')
+            observe('session_store_duration_seconds', time.perf_counter() - start, operation='save')
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def _is_admin():
+    from models import db, User
+    user_id = session.get('user_id')
+    user = db.session.get(User, user_id) if user_id else None
+    return bool(user and user.is_admin)
+
+
+def init_metrics(app):
+    """Record request, query and session metrics and expose them on /metrics"""
+    from request_timing import observe_queries
+
+    exporter = MetricsExporter(
+        app,
+        app.config.get('METRICS_DIR', './metrics'),
+        flush_interval=app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+    )
+    app.extensions['metrics'] = exporter
+    app.session_interface = InstrumentedSessionInterface(app.session_interface)
+    atexit.register(exporter.flush)
+
+    def record_query(statement, parameters, duration, executemany):
+        inc('db_queries_total')
+        observe('db_query_duration_seconds', duration)
+    observe_queries(app, record_query)
+
+    @app.after_request
+    def record_request(response):
+        start = g.get('request_start')
+        endpoint = request.endpoint or 'unmatched'
+        status = str(response.status_code)
+        inc('http_requests_total', endpoint=endpoint, method=request.method, status=status)
+        if start is not None:
+            observe('http_request_duration_seconds', time.perf_counter() - start, endpoint=endpoint, status=status)
+        exporter.maybe_flush()
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        # Scrapers authenticate with METRICS_TOKEN; without it only a logged-in admin gets through
+        token = app.config.get('METRICS_TOKEN')
+        authorized = bool(token) and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+        if not authorized and not _is_admin():
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(exporter.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return exporter
@@ -3,8 +3,9 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import uuid
 from typing import List, Optional
+from read_engine import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -34,6 +35,7 @@ class Project(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.String(300))  # Plain-text start of description for list cards
     image_url = db.Column(db.String(500))
     github_url = db.Column(db.String(500))
     live_url = db.Column(db.String(500))
@@ -43,8 +45,13 @@ class Project(db.Model):
     linkedin_post = db.Column(db.Text)
     linkedin_post_url = db.Column(db.String(500))  # URL do post no LinkedIn
     additional_images = db.Column(db.JSON)  # Array de URLs de imagens adicionais
+    sort_order = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Display order, ascending
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_projects_published_order', 'published', 'sort_order', 'id'),
+    )
 
 
 class Experience(db.Model):
@@ -56,14 +63,20 @@ class Experience(db.Model):
     start_date = db.Column(db.DateTime, nullable=False)
     end_date = db.Column(db.DateTime)
     description = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.String(300))  # Plain-text start of description for list cards
     technologies = db.Column(db.JSON)
     published = db.Column(db.Boolean, default=False)
     linkedin_post = db.Column(db.Text)
     linkedin_post_url = db.Column(db.String(500))  # URL do post no LinkedIn
     company_logo_url = db.Column(db.String(500))  # Logo da empresa
     additional_images = db.Column(db.JSON)  # Array de URLs de imagens adicionais
+    sort_order = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Display order, ascending
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_experiences_published_order', 'published', 'sort_order', 'id'),
+    )
 
 
 class Achievement(db.Model):
@@ -72,6 +85,7 @@ class Achievement(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.String(300))  # Plain-text start of description for list cards
     date = db.Column(db.DateTime, nullable=False)
     type = db.Column(db.String(50), nullable=False)  # certification, award, speaking, etc
     certificate_url = db.Column(db.String(500))
@@ -80,8 +94,35 @@ class Achievement(db.Model):
     linkedin_post_url = db.Column(db.String(500))  # URL do post no LinkedIn
     badge_image_url = db.Column(db.String(500))  # Imagem do badge/certificado
     additional_images = db.Column(db.JSON)  # Array de URLs de imagens adicionais
+    sort_order = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Display order, ascending
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_achievements_published_order', 'published', 'sort_order', 'id'),
+    )
+
+
+class Technology(db.Model):
+    __tablename__ = 'technologies'
+    
+    slug = db.Column(db.String(100), primary_key=True)  # Normalized name, e.g. "node.js"
+    name = db.Column(db.String(100), nullable=False)  # Display name as first entered
+    project_count = db.Column(db.Integer, default=0, nullable=False)  # Published projects using it
+    experience_count = db.Column(db.Integer, default=0, nullable=False)  # Published experiences using it
+
+
+class ItemTechnology(db.Model):
+    __tablename__ = 'item_technologies'
+    
+    item_type = db.Column(db.String(50), primary_key=True)  # project, experience
+    item_id = db.Column(db.String(36), primary_key=True)
+    technology_slug = db.Column(db.String(100), db.ForeignKey('technologies.slug'), primary_key=True)
+    published = db.Column(db.Boolean, default=False, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_item_technologies_lookup', 'technology_slug', 'item_type', 'published', 'item_id'),
+    )
 
 
 class Like(db.Model):
@@ -92,6 +133,11 @@ class Like(db.Model):
     item_type = db.Column(db.String(50), nullable=False)  # project, achievement, comment
     item_id = db.Column(db.String(36), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_likes_item_user', 'item_type', 'item_id', 'user_id'),
+        db.Index('ix_likes_created', 'created_at'),  # Rollup compactor scans new rows by time
+    )
 
 
 class Comment(db.Model):
@@ -107,6 +153,54 @@ class Comment(db.Model):
     parent_id = db.Column(db.String(36))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_comments_item_created', 'item_type', 'item_id', 'created_at'),
+        db.Index('ix_comments_created', 'created_at'),
+    )
+
+
+# Like and comment totals per item, updated by StatsService in the same transaction as the write
+class ItemStats(db.Model):
+    __tablename__ = 'item_stats'
+    
+    item_type = db.Column(db.String(50), primary_key=True)  # project, experience, achievement, comment, contact
+    item_id = db.Column(db.String(36), primary_key=True)
+    like_count = db.Column(db.Integer, default=0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+
+
+# Likes and comments per creation day and item type, updated the same way
+class DailyStats(db.Model):
+    __tablename__ = 'daily_stats'
+    
+    day = db.Column(db.Date, primary_key=True)
+    item_type = db.Column(db.String(50), primary_key=True)
+    like_count = db.Column(db.Integer, default=0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+
+
+# Likes and comments created per day and item, appended by the rollup compactor from rows
+# newer than its watermark. Later unlikes and deletions don't change past days.
+class EngagementRollup(db.Model):
+    __tablename__ = 'engagement_rollups'
+    
+    day = db.Column(db.Date, primary_key=True)
+    item_type = db.Column(db.String(50), primary_key=True)
+    item_id = db.Column(db.String(36), primary_key=True)
+    like_count = db.Column(db.Integer, default=0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_engagement_rollups_item_day', 'item_type', 'item_id', 'day'),
+    )
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = 'rollup_watermarks'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=False)  # Rows created before this are rolled up
 
 
 class File(db.Model):
@@ -0,0 +1,105 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Counters for one connection pool. Survives pool recreation"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.timeouts = 0
+        self.connects = 0
+        self.pre_ping_failures = 0
+
+    def record_checkout(self, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if wait <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            # Pool exhausted: pool_size + max_overflow connections busy for pool_timeout seconds
+            self.metrics.increment('timeouts')
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _engines(app):
+    # Per app, so a second create_app() in the same process doesn't replace the first one's pools
+    return app.extensions.setdefault('pool_engines', {})
+
+
+def instrument_engine(app, engine, name):
+    """Register an engine of the app for pool metrics and count connects and failed pre-pings"""
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return
+    _engines(app)[name] = engine
+    
+    @event.listens_for(engine, 'connect')
+    def count_connect(dbapi_connection, connection_record):
+        engine.pool.metrics.increment('connects')
+    
+    @event.listens_for(engine, 'handle_error')
+    def count_pre_ping_failure(context):
+        if context.is_pre_ping:
+            engine.pool.metrics.increment('pre_ping_failures')
+
+
+def snapshot(app) -> dict:
+    """Current state and counters of every instrumented pool of the app"""
+    result = {}
+    for name, engine in _engines(app).items():
+        pool = engine.pool
+        metrics = pool.metrics
+        result[name] = {
+            'size': pool.size(),
+            'maxOverflow': pool._max_overflow,
+            'timeout': pool.timeout(),
+            'checkedOut': pool.checkedout(),
+            'checkedIn': pool.checkedin(),
+            'overflow': pool.overflow(),
+            'checkouts': metrics.checkouts,
+            'checkoutWaitAvgMs': round(metrics.wait_total / metrics.checkouts * 1000, 3) if metrics.checkouts else 0,
+            'checkoutWaitMaxMs': round(metrics.wait_max * 1000, 3),
+            'checkoutWaitTotalMs': round(metrics.wait_total * 1000, 3),
+            'checkoutWaitBuckets': {str(bound): count for bound, count in zip(WAIT_BUCKETS, metrics.wait_buckets)},
+            'timeouts': metrics.timeouts,
+            'connects': metrics.connects,
+            'prePingFailures': metrics.pre_ping_failures,
+        }
+    return result
@@ -0,0 +1,82 @@
+from flask import g, has_app_context, current_app, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+
+# GET endpoints that must see the primary, e.g. right after the user's own write
+PRIMARY_READ_ENDPOINTS = {'get_current_user'}
+# Short-lived cookie set by writes: its client reads from the primary while it lasts
+READ_PRIMARY_COOKIE = 'read_primary'
+
+
+class RoutingSession(Session):
+    """Session that sends reads of public GET requests to the read-only engine"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('use_read_engine'):
+            engine = current_app.extensions.get('read_engine')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _read_only_sqlite_uri(primary):
+    """Read-only URI for the same SQLite file as the primary engine"""
+    path = primary.url.database
+    if not path or path == ':memory:' or path.startswith('file:'):
+        return None
+    return f"sqlite:///file:{path}?mode=ro&uri=true"
+
+
+def init_read_engine(app, db):
+    """Create the read-only engine and route public GET requests to it"""
+    with app.app_context():
+        primary = db.engine
+    
+    uri = app.config.get('SQLALCHEMY_READ_DATABASE_URI')
+    if not uri and primary.dialect.name == 'sqlite':
+        uri = _read_only_sqlite_uri(primary)
+    if not uri:
+        # No replica configured: everything keeps using the primary engine
+        return None
+    
+    options = dict(app.config.get('SQLALCHEMY_READ_ENGINE_OPTIONS', {}))
+    if uri.startswith('sqlite'):
+        options.setdefault('connect_args', {'check_same_thread': False})
+    
+    engine = create_engine(uri, **options)
+    
+    from sqlite_profile import init_sqlite_profile
+    from pool_metrics import instrument_engine
+    init_sqlite_profile(app, engine, read_only=True)
+    instrument_engine(app, engine, 'read')
+    
+    app.extensions['read_engine'] = engine
+    
+    # Only a configured replica can lag; the read-only SQLite engine opens the primary file itself
+    window = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+    pin_after_writes = bool(app.config.get('SQLALCHEMY_READ_DATABASE_URI')) and window > 0
+    
+    @app.before_request
+    def route_public_reads():
+        if pin_after_writes and request.cookies.get(READ_PRIMARY_COOKIE):
+            g.read_primary = True
+            return
+        if (request.method in ('GET', 'HEAD')
+                and request.path.startswith('/api/')
+                and not request.path.startswith('/api/admin')
+                and request.endpoint not in PRIMARY_READ_ENDPOINTS):
+            g.use_read_engine = True
+    
+    if pin_after_writes:
+        @app.after_request
+        def pin_reads_to_primary(response):
+            if (request.method not in ('GET', 'HEAD', 'OPTIONS')
+                    and request.path.startswith('/api/')
+                    and response.status_code < 400):
+                response.set_cookie(
+                    READ_PRIMARY_COOKIE, '1', max_age=window, httponly=True, samesite='Lax',
+                    secure=app.config.get('SESSION_COOKIE_SECURE', False)
+                )
+            return response
+    
+    return engine
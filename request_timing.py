@@ -0,0 +1,77 @@
+import time
+from flask import g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that adds its serialization time to the current request"""
+    
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            if has_request_context():
+                g.serialize_time = g.get('serialize_time', 0.0) + time.perf_counter() - start
+
+
+def _query_observers(app):
+    # Callables notified of every statement as fn(statement, parameters, duration, executemany).
+    # Kept per app so a second create_app() in the same process doesn't notify twice
+    return app.extensions.setdefault('query_observers', [])
+
+
+def observe_queries(app, fn):
+    """Register a callable that sees every statement tracked for this app and its duration"""
+    _query_observers(app).append(fn)
+    return fn
+
+
+def track_queries(app, engine):
+    """Count statements and DB time of the current request on this engine"""
+    observers = _query_observers(app)
+    
+    # The start time lives on the statement's execution context: a statement that raises
+    # never reaches after_cursor_execute, and its context is dropped with it
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._query_start
+        if has_request_context():
+            g.db_time = g.get('db_time', 0.0) + duration
+            g.db_queries = g.get('db_queries', 0) + 1
+        for observer in observers:
+            observer(statement, parameters, duration, executemany)
+
+
+def init_request_timing(app):
+    """Start the per-request clock and switch to the timed JSON provider"""
+    app.json = TimedJSONProvider(app)
+    
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+
+def add_server_timing(response):
+    """Attach total, DB, query count and serialization time as a Server-Timing header"""
+    start = g.get('request_start')
+    if start is None:
+        return response
+    
+    total = (time.perf_counter() - start) * 1000
+    db_time = g.get('db_time', 0.0) * 1000
+    queries = g.get('db_queries', 0)
+    serialize = g.get('serialize_time', 0.0) * 1000
+    
+    response.headers['Server-Timing'] = ', '.join([
+        f'db;dur={db_time:.2f};desc="{queries} queries"',
+        f'serialize;dur={serialize:.2f}',
+        f'app;dur={max(total - db_time - serialize, 0):.2f}',
+        f'total;dur={total:.2f}',
+    ])
+    return response
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, request, make_response, Response
+import metrics
+
+
+def _cache_key():
+    """Endpoint, URL arguments and query string, with ?fields= order and duplicates ignored"""
+    args = []
+    for name, values in sorted(request.args.lists()):
+        if name == 'fields':
+            values = [','.join(sorted({key.strip() for value in values for key in value.split(',') if key.strip()}))]
+        args.append((name, tuple(values)))
+    return request.endpoint, tuple(sorted((request.view_args or {}).items())), tuple(args)
+
+
+class ResponseCache:
+    """In-process cache of rendered JSON responses for public GET endpoints.
+
+    Entries are tagged with the kinds of data they contain and dropped when a
+    write invalidates one of their tags, or after `ttl` seconds at the latest.
+    Responses carry an ETag of their body, so clients revalidate with a 304.
+    """
+
+    def __init__(self, enabled=True, max_entries=512, ttl=60):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    def _generation(self, tags):
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, tags, generation, value = entry
+            if expires < time.monotonic() or generation != self._generation(tags):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self, tags):
+        with self._lock:
+            return self._generation(tags)
+
+    def set(self, key, value, tags, generation):
+        """Store a value computed when `tags` were at `generation`"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, tags, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tags):
+        """Drop every entry tagged with any of the tags"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def cached(self, *tags):
+        """Cache successful responses of a view per URL and field set.
+
+        Responses with embedded engagement counts (?counts=1) are also tagged 'engagement'.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return f(*args, **kwargs)
+
+                key = _cache_key()
+                # Right after its own write a client reads the primary (read_engine.py), so it
+                # skips entries a lagging replica may have produced; its fresh response replaces them
+                hit = None if g.get('read_primary') else self.get(key)
+                if hit is not None:
+                    metrics.inc('cache_requests_total', cache='response', result='hit')
+                    body, mimetype, etag = hit
+                    response = Response(body, mimetype=mimetype)
+                    response.set_etag(etag)
+                    return response.make_conditional(request)
+
+                metrics.inc('cache_requests_total', cache='response', result='miss')
+                entry_tags = tags + ('engagement',) if request.args.get('counts') in ('1', 'true') else tags
+                # Taken before the view runs: a write committed meanwhile invalidates the new entry
+                generation = self.generation(entry_tags)
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    response.add_etag()
+                    self.set(key, (response.get_data(), response.mimetype, response.get_etag()[0]), entry_tags, generation)
+                    return response.make_conditional(request)
+                return response
+            return decorated_function
+        return decorator
+
+
+def init_response_cache(app):
+    """Create the response cache used by the public read endpoints"""
+    cache = ResponseCache(
+        enabled=app.config.get('RESPONSE_CACHE_ENABLED', True),
+        max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512),
+        ttl=app.config.get('RESPONSE_CACHE_TTL', 60)
+    )
+    app.extensions['response_cache'] = cache
+    return cache
@@ -0,0 +1,208 @@
+import time
+from datetime import datetime, date, timedelta
+import click
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from models import db, Like, Comment, EngagementRollup, RollupWatermark
+from stats_service import increment_counts
+from worker_thread import WorkerThread
+
+WATERMARK = 'engagement'
+INTERVALS = ('day', 'week', 'month')
+
+
+def _bucket(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _buckets(start, end, interval):
+    """Every bucket start between two dates, so empty periods show up as zeros"""
+    buckets = []
+    current = _bucket(start, interval)
+    while current <= end:
+        buckets.append(current)
+        if interval == 'month':
+            current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        else:
+            current += timedelta(days=7 if interval == 'week' else 1)
+    return buckets
+
+
+class RollupCompactor:
+    """Rolls likes and comments up into per-day, per-item counts for trend charts.
+
+    compact_window() aggregates the rows of one day after the stored watermark and
+    moves the watermark past them in the same transaction, claiming it with a
+    conditional UPDATE so two workers never count the same rows. A backlog (first
+    run, downtime) is worked off one day per transaction. Rows younger than `lag`
+    seconds are left for the next run in case their transaction hasn't committed.
+
+    Rows are selected by created_at, so a row that commits more than `lag` seconds
+    after its created_at (a stalled transaction, backdated or imported data) lands
+    behind the watermark and is never counted. rebuild() recounts everything.
+    """
+
+    def __init__(self, app, interval=300, lag=60):
+        self.app = app
+        self.interval = interval
+        self.lag = lag
+        self._thread = WorkerThread(self._run, 'rollup-compactor')
+
+    def watermark(self):
+        state = db.session.get(RollupWatermark, WATERMARK)
+        return state.watermark if state else None
+
+    def _window_end(self, since, until):
+        """End of the next window: midnight after the oldest row not rolled up yet, at most `until`"""
+        oldest = None
+        for model in (Like, Comment):
+            query = db.select(func.min(model.created_at)).where(model.created_at < until)
+            if since is not None:
+                query = query.where(model.created_at >= since)
+            first = db.session.execute(query).scalar()
+            if first is not None and (oldest is None or first < oldest):
+                oldest = first
+        if oldest is None:
+            return until
+        # Days without rows are skipped rather than compacted one empty window at a time
+        return min(datetime.combine(oldest.date() + timedelta(days=1), datetime.min.time()), until)
+
+    def compact_window(self):
+        """Roll up one day of rows after the watermark in its own transaction.
+
+        Returns how many rows were counted. Only the last window, which reaches up to
+        `now - lag`, can be empty, so 0 means the rollup has caught up.
+        """
+        since = self.watermark()
+        until = datetime.utcnow() - timedelta(seconds=self.lag)
+        if since is not None and since >= until:
+            return 0
+        end = self._window_end(since, until)
+
+        try:
+            if since is None:
+                db.session.add(RollupWatermark(name=WATERMARK, watermark=end))
+                db.session.flush()
+            else:
+                claimed = db.session.execute(
+                    db.update(RollupWatermark)
+                    .where(RollupWatermark.name == WATERMARK, RollupWatermark.watermark == since)
+                    .values(watermark=end)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if not claimed:
+                    # Another worker is compacting this range
+                    db.session.rollback()
+                    return 0
+        except IntegrityError:
+            db.session.rollback()
+            return 0
+
+        counts = {}
+        total = 0
+        for model, column in ((Like, 'like_count'), (Comment, 'comment_count')):
+            query = db.select(model.item_type, model.item_id, model.created_at).where(model.created_at < end)
+            if since is not None:
+                query = query.where(model.created_at >= since)
+            # Grouped in Python: date functions differ between SQLite and PostgreSQL
+            for item_type, item_id, created_at in db.session.execute(query.execution_options(yield_per=5000)):
+                key = (created_at.date(), item_type, item_id)
+                row = counts.setdefault(key, {'like_count': 0, 'comment_count': 0})
+                row[column] += 1
+                total += 1
+
+        for (day, item_type, item_id), deltas in counts.items():
+            increment_counts(EngagementRollup, {'day': day, 'item_type': item_type, 'item_id': item_id}, **deltas)
+        db.session.commit()
+        return total
+
+    def compact(self) -> int:
+        """Roll up every row created since the watermark. Returns how many rows were counted"""
+        total = 0
+        while True:
+            counted = self.compact_window()
+            if not counted:
+                return total
+            total += counted
+
+    def rebuild(self) -> int:
+        """Drop the rollup and its watermark and roll up every row again"""
+        db.session.execute(db.delete(EngagementRollup))
+        db.session.execute(db.delete(RollupWatermark).where(RollupWatermark.name == WATERMARK))
+        db.session.commit()
+        return self.compact()
+
+    def timeseries(self, start, end, interval='day', item_type=None, item_id=None) -> dict:
+        """Likes, comments and contact messages per period between two dates, from the rollup only"""
+        query = db.select(
+            EngagementRollup.day,
+            EngagementRollup.item_type == 'contact',
+            func.sum(EngagementRollup.like_count),
+            func.sum(EngagementRollup.comment_count)
+        ).where(EngagementRollup.day >= start, EngagementRollup.day <= end)
+        if item_type:
+            query = query.where(EngagementRollup.item_type == item_type)
+        if item_id:
+            query = query.where(EngagementRollup.item_id == item_id)
+        query = query.group_by(EngagementRollup.day, EngagementRollup.item_type == 'contact')
+
+        points = {
+            bucket: {'date': bucket.isoformat(), 'likes': 0, 'comments': 0, 'contacts': 0}
+            for bucket in _buckets(start, end, interval)
+        }
+        for day, is_contact, likes, comments in db.session.execute(query):
+            point = points[_bucket(day, interval)]
+            point['likes'] += likes or 0
+            point['contacts' if is_contact else 'comments'] += comments or 0
+
+        watermark = self.watermark()
+        return {
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'interval': interval,
+            'compactedUntil': watermark.isoformat() if watermark else None,
+            'points': list(points.values()),
+        }
+
+    def ensure_running(self):
+        if self.interval:
+            self._thread.ensure_running()
+
+    def _run(self):
+        write_queue = self.app.extensions['write_queue']
+        while True:
+            time.sleep(self.interval)
+            with self.app.app_context():
+                try:
+                    # One window per job: likes and comments queued meanwhile get the writer in between
+                    while write_queue.submit(self.compact_window):
+                        pass
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Rollup compaction failed: {e}")
+
+
+def init_rollups(app):
+    """Create the rollup compactor, started by the first request of each worker"""
+    compactor = RollupCompactor(
+        app,
+        interval=app.config.get('ROLLUP_INTERVAL', 300),
+        lag=app.config.get('ROLLUP_LAG', 60)
+    )
+    app.extensions['rollups'] = compactor
+
+    @app.cli.command('compact-rollups')
+    @click.option('--rebuild', is_flag=True, help='Recount every like and comment, e.g. after importing data.')
+    def compact_rollups_command(rebuild):
+        """Roll up likes and comments created since the last run."""
+        click.echo(f"Rolled up {compactor.rebuild() if rebuild else compactor.compact()} rows")
+
+    @app.before_request
+    def start_rollup_compactor():
+        compactor.ensure_running()
+
+    return compactor
@@ -0,0 +1,170 @@
+import json
+import os
+import click
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from models import db, User, Project, Experience, Achievement, ItemTechnology, ItemStats, Like, Comment
+from search_service import SearchService
+from technology_service import TechnologyService
+from stats_service import StatsService
+from serializers import make_excerpt
+
+# Bump when models change so workers warn until `flask init-db` runs again
+SCHEMA_VERSION = 5
+
+
+def _database_label(app):
+    """Database URI without the password, stored in the marker file"""
+    return make_url(app.config['SQLALCHEMY_DATABASE_URI']).render_as_string(hide_password=True)
+
+
+def schema_is_current(app) -> bool:
+    """Check the marker file written by init_db. Reads one small file, runs no queries"""
+    try:
+        with open(app.config['SCHEMA_MARKER_FILE'], encoding='utf-8') as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return marker.get('version') == SCHEMA_VERSION and marker.get('database') == _database_label(app)
+
+
+def _write_marker(app):
+    path = app.config['SCHEMA_MARKER_FILE']
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': SCHEMA_VERSION, 'database': _database_label(app)}, f)
+
+
+def _add_missing_columns():
+    """ALTER existing tables to add model columns they lack. create_all only creates tables"""
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f'{column.name} {column.type.compile(dialect=db.engine.dialect)}'
+                if isinstance(getattr(column.server_default, 'arg', None), str):
+                    # NOT NULL columns can only be added with a default for the existing rows
+                    ddl += f" DEFAULT '{column.server_default.arg}'" + ('' if column.nullable else ' NOT NULL')
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                print(f"Added column {table.name}.{column.name}")
+
+
+def _add_missing_indexes():
+    """CREATE model indexes that existing tables lack"""
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                print(f"Added index {index.name}")
+
+
+def _backfill_excerpts():
+    """Compute list excerpts for rows written before the excerpt column existed"""
+    for model in (Project, Experience, Achievement):
+        rows = db.session.execute(db.select(model.id, model.description).where(model.excerpt.is_(None))).all()
+        if rows:
+            db.session.execute(db.update(model), [
+                {'id': row.id, 'excerpt': make_excerpt(row.description)} for row in rows
+            ])
+    db.session.commit()
+
+
+def _backfill_sort_order():
+    """Number rows of tables that have never been ordered by creation time, the order they used to list in"""
+    for model in (Project, Experience, Achievement):
+        if db.session.execute(db.select(db.func.max(model.sort_order))).scalar():
+            continue
+        ids = db.session.execute(db.select(model.id).order_by(model.created_at, model.id)).scalars().all()
+        if len(ids) > 1:
+            db.session.execute(db.update(model), [
+                {'id': item_id, 'sort_order': index} for index, item_id in enumerate(ids)
+            ])
+    db.session.commit()
+
+
+def init_db(app):
+    """Create tables and indexes and backfill derived data. Safe to run repeatedly"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    with db.engine.connect() as conn:
+        if 'postgresql' in uri:
+            conn.execute(text("SET client_encoding TO 'UTF8'"))
+        elif 'sqlite' in uri:
+            # Only effective before the first table is created
+            conn.execute(text('PRAGMA encoding = "UTF-8"'))
+        conn.commit()
+
+    db.create_all()
+    _add_missing_columns()
+    _add_missing_indexes()
+    _backfill_excerpts()
+    _backfill_sort_order()
+
+    # Build the full-text search index on first run
+    if SearchService.ensure_index():
+        SearchService.rebuild()
+
+    # Backfill the technology tag index on first run
+    if not ItemTechnology.query.first():
+        TechnologyService.rebuild()
+
+    # Backfill the dashboard aggregates when upgrading a database that has engagement
+    if not ItemStats.query.first() and (Like.query.first() or Comment.query.first()):
+        StatsService.rebuild()
+
+    _write_marker(app)
+
+
+def seed_admin(email='admin@example.com', password='admin123') -> bool:
+    """Create the default admin user if there is no admin. Returns True when created"""
+    if User.query.filter_by(is_admin=True).first():
+        return False
+    admin = User()
+    admin.email = email
+    admin.password = password
+    admin.first_name = 'Admin'
+    admin.last_name = 'User'
+    admin.is_admin = True
+    db.session.add(admin)
+    db.session.commit()
+    return True
+
+
+def init_schema(app):
+    """Register the init-db/seed commands and check the schema marker at boot"""
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, search and technology indexes."""
+        init_db(app)
+        click.echo(f"Database initialized (schema version {SCHEMA_VERSION})")
+
+    @app.cli.command('seed')
+    @click.option('--email', default='admin@example.com')
+    @click.option('--password', default='admin123')
+    def seed_command(email, password):
+        """Create the default admin user if none exists."""
+        if seed_admin(email, password):
+            click.echo(f"Created default admin user: {email} / {password}")
+        else:
+            click.echo("An admin user already exists")
+
+    if schema_is_current(app):
+        return
+    if app.config.get('AUTO_INIT_DB'):
+        with app.app_context():
+            init_db(app)
+            if seed_admin():
+                print("Created default admin user: admin@example.com / admin123")
+    else:
+        print("Database schema is missing or outdated, run: flask --app app init-db && flask --app app seed")
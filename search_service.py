@@ -0,0 +1,178 @@
+import html
+import re
+from sqlalchemy import text
+from models import db
+
+SEARCH_TABLE = 'search_index'
+MAX_PER_PAGE = 50
+
+# Column weights used for ranking: title > technologies > body
+TITLE_WEIGHT = 10.0
+TECHNOLOGIES_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Private-use characters around matched terms; the body text is escaped before they become <mark>
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def _highlight(snippet):
+    """HTML-escaped snippet with the matched terms wrapped in <mark>"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _terms(query):
+    """Split a user query into plain search terms"""
+    return _TERM_RE.findall(query or '')[:10]
+
+
+def _document_for(item_type, item):
+    """Build the indexed document (title, technologies, body) for a content item"""
+    if item_type == 'experience':
+        title = f"{item.position or ''} {item.company or ''}".strip()
+    else:
+        title = item.title or ''
+    technologies = ' '.join(getattr(item, 'technologies', None) or [])
+    body = '\n'.join(part for part in [item.description, item.linkedin_post] if part)
+    return title, technologies, body
+
+
+class SearchService:
+    @staticmethod
+    def ensure_index() -> bool:
+        """Create the search index if missing. Returns True when it was just created"""
+        dialect = _dialect()
+        if dialect == 'sqlite':
+            exists = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': SEARCH_TABLE}
+            ).first()
+            if exists:
+                return False
+            db.session.execute(text(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                "item_type UNINDEXED, item_id UNINDEXED, title, technologies, body, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            ))
+        else:
+            exists = db.inspect(db.engine).has_table(SEARCH_TABLE)
+            if exists:
+                return False
+            db.session.execute(text(
+                f"CREATE TABLE {SEARCH_TABLE} ("
+                "item_type VARCHAR(50) NOT NULL, item_id VARCHAR(36) NOT NULL, "
+                "title TEXT, technologies TEXT, body TEXT, "
+                "PRIMARY KEY (item_type, item_id))"
+            ))
+            if dialect == 'postgresql':
+                db.session.execute(text(
+                    f"ALTER TABLE {SEARCH_TABLE} ADD COLUMN document tsvector GENERATED ALWAYS AS ("
+                    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+                    "setweight(to_tsvector('simple', coalesce(technologies, '')), 'B') || "
+                    "setweight(to_tsvector('simple', coalesce(body, '')), 'C')) STORED"
+                ))
+                db.session.execute(text(
+                    f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"
+                ))
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def rebuild():
+        """Re-index every published project, experience and achievement"""
+        from models import Project, Experience, Achievement
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        for item_type, model in (('project', Project), ('experience', Experience), ('achievement', Achievement)):
+            for item in model.query.filter_by(published=True).all():
+                SearchService.index_item(item_type, item)
+        db.session.commit()
+
+    @staticmethod
+    def index_item(item_type: str, item):
+        """Add, refresh or drop an item in the index. Runs inside the caller's transaction"""
+        SearchService.remove_item(item_type, item.id)
+        if not item.published:
+            return
+        title, technologies, body = _document_for(item_type, item)
+        db.session.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (item_type, item_id, title, technologies, body) "
+                 "VALUES (:item_type, :item_id, :title, :technologies, :body)"),
+            {'item_type': item_type, 'item_id': item.id, 'title': title,
+             'technologies': technologies, 'body': body}
+        )
+
+    @staticmethod
+    def remove_item(item_type: str, item_id: str):
+        """Remove an item from the index. Runs inside the caller's transaction"""
+        db.session.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE item_type = :item_type AND item_id = :item_id"),
+            {'item_type': item_type, 'item_id': item_id}
+        )
+
+    @staticmethod
+    def search(query: str, item_type: str | None = None, page: int = 1, per_page: int = 10) -> dict:
+        """Run a ranked, paginated search and return hits with a highlighted snippet"""
+        page = max(page, 1)
+        per_page = min(max(per_page, 1), MAX_PER_PAGE)
+        result = {'query': query, 'page': page, 'perPage': per_page, 'total': 0, 'results': []}
+
+        terms = _terms(query)
+        if not terms:
+            return result
+
+        params = {'limit': per_page, 'offset': (page - 1) * per_page, 'mark_start': MARK_START, 'mark_end': MARK_END}
+        type_filter = ''
+        if item_type:
+            type_filter = 'AND item_type = :item_type'
+            params['item_type'] = item_type
+
+        dialect = _dialect()
+        if dialect == 'sqlite':
+            # Prefix match on every term, e.g. "reac"* AND "flas"*
+            params['match'] = ' AND '.join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+            where = f"{SEARCH_TABLE} MATCH :match {type_filter}"
+            rank = f"-bm25({SEARCH_TABLE}, 0, 0, {TITLE_WEIGHT}, {TECHNOLOGIES_WEIGHT}, {BODY_WEIGHT})"
+            select = (f"SELECT item_type, item_id, title, "
+                      f"snippet({SEARCH_TABLE}, 4, :mark_start, :mark_end, '…', 16) AS snippet, "
+                      f"{rank} AS score FROM {SEARCH_TABLE} WHERE {where} "
+                      f"ORDER BY score DESC LIMIT :limit OFFSET :offset")
+        elif dialect == 'postgresql':
+            params['match'] = ' & '.join(f"{t}:*" for t in terms)
+            params['headline_options'] = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=24, MinWords=8'
+            where = f"document @@ to_tsquery('simple', :match) {type_filter}"
+            select = (f"SELECT item_type, item_id, title, "
+                      f"ts_headline('simple', coalesce(body, ''), to_tsquery('simple', :match), "
+                      f":headline_options) AS snippet, "
+                      f"ts_rank_cd(document, to_tsquery('simple', :match)) AS score "
+                      f"FROM {SEARCH_TABLE} WHERE {where} "
+                      f"ORDER BY score DESC LIMIT :limit OFFSET :offset")
+        else:
+            # Fallback for backends without a full-text engine: substring match on every term
+            clauses = []
+            for i, term in enumerate(terms):
+                params[f'term{i}'] = f'%{term}%'
+                clauses.append(f"(title LIKE :term{i} OR technologies LIKE :term{i} OR body LIKE :term{i})")
+            where = f"{' AND '.join(clauses)} {type_filter}"
+            select = (f"SELECT item_type, item_id, title, substr(body, 1, 160) AS snippet, 0 AS score "
+                      f"FROM {SEARCH_TABLE} WHERE {where} ORDER BY title LIMIT :limit OFFSET :offset")
+
+        result['total'] = db.session.execute(
+            text(f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {where}"), params
+        ).scalar() or 0
+        rows = db.session.execute(text(select), params).all()
+        result['results'] = [{
+            'itemType': row.item_type,
+            'itemId': row.item_id,
+            'title': row.title,
+            'snippet': _highlight(row.snippet),
+            'score': float(row.score or 0)
+        } for row in rows]
+        return result
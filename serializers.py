@@ -0,0 +1,186 @@
+import re
+from models import db, User, Project, Experience, Achievement, Comment
+
+EXCERPT_LENGTH = 200
+
+_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MARKUP_RE = re.compile(r'[*`#>]+|\b_+|_+\b(?!\w)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class InvalidFields(ValueError):
+    """Raised for unknown keys in a ?fields= parameter"""
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Plain-text start of a description, cut at a word boundary"""
+    text = _MARKUP_RE.sub('', _LINK_RE.sub(r'\1', text or ''))
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if len(text) <= length:
+        return text
+    cut = text.rfind(' ', 0, length)
+    return text[:cut if cut > 0 else length].rstrip(' ,.;:') + '…'
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _list(value):
+    return value or []
+
+
+class Serializer:
+    """API representation of a model: camelCase keys mapped to columns.
+
+    dump() serializes a loaded entity. select()/fetch() serialize straight from
+    column-projected rows, skipping ORM hydration for list endpoints.
+    """
+
+    def __init__(self, model, **fields):
+        self.model = model
+        self.fields = fields
+        self._converters = {}
+        for key, attribute in fields.items():
+            column_type = getattr(model, attribute).type
+            if isinstance(column_type, db.DateTime):
+                self._converters[key] = _isoformat
+            elif isinstance(column_type, db.JSON):
+                self._converters[key] = _list
+
+    def without(self, *keys):
+        """A serializer for the same model minus some keys, e.g. a summary representation"""
+        return Serializer(self.model, **{key: attribute for key, attribute in self.fields.items() if key not in keys})
+
+    def parse_fields(self, value, required=('id',)):
+        """Keys requested with ?fields=a,b (plus the required ones), or None for all keys"""
+        if not value:
+            return None
+        requested = {key.strip() for key in value.split(',') if key.strip()}
+        unknown = requested - self.fields.keys()
+        if unknown:
+            raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return [key for key in self.fields if key in requested or key in required]
+
+    def dump(self, obj, fields=None) -> dict:
+        converters = self._converters
+        data = {}
+        for key, attribute in self.fields.items():
+            if fields is not None and key not in fields:
+                continue
+            value = getattr(obj, attribute)
+            convert = converters.get(key)
+            data[key] = convert(value) if convert else value
+        return data
+
+    def columns(self, fields=None) -> list:
+        """Labelled columns for the given keys (all keys by default)"""
+        keys = self.fields if fields is None else [key for key in self.fields if key in fields]
+        return [getattr(self.model, self.fields[key]).label(key) for key in keys]
+
+    def select(self, fields=None):
+        return db.select(*self.columns(fields))
+
+    def fetch(self, statement) -> list:
+        """Execute a statement built from select() and return API dicts"""
+        result = db.session.execute(statement)
+        keys = list(result.keys())
+        converters = [self._converters.get(key) for key in keys]
+        return [
+            {key: convert(value) if convert else value for key, convert, value in zip(keys, converters, row)}
+            for row in result
+        ]
+
+
+USER = Serializer(
+    User,
+    id='id',
+    email='email',
+    firstName='first_name',
+    lastName='last_name',
+    profileImageUrl='profile_image_url',
+    heroImageUrl='hero_image_url',
+    linkedinUrl='linkedin_url',
+    githubUrl='github_url',
+    isAdmin='is_admin',
+    createdAt='created_at',
+    updatedAt='updated_at',
+)
+
+PROJECT = Serializer(
+    Project,
+    id='id',
+    title='title',
+    description='description',
+    excerpt='excerpt',
+    imageUrl='image_url',
+    githubUrl='github_url',
+    liveUrl='live_url',
+    technologies='technologies',
+    featured='featured',
+    published='published',
+    linkedinPost='linkedin_post',
+    linkedinPostUrl='linkedin_post_url',
+    additionalImages='additional_images',
+    sortOrder='sort_order',
+    createdAt='created_at',
+    updatedAt='updated_at',
+)
+
+EXPERIENCE = Serializer(
+    Experience,
+    id='id',
+    position='position',
+    company='company',
+    startDate='start_date',
+    endDate='end_date',
+    description='description',
+    excerpt='excerpt',
+    technologies='technologies',
+    published='published',
+    linkedinPost='linkedin_post',
+    linkedinPostUrl='linkedin_post_url',
+    companyLogoUrl='company_logo_url',
+    additionalImages='additional_images',
+    sortOrder='sort_order',
+    createdAt='created_at',
+    updatedAt='updated_at',
+)
+
+ACHIEVEMENT = Serializer(
+    Achievement,
+    id='id',
+    title='title',
+    description='description',
+    excerpt='excerpt',
+    date='date',
+    type='type',
+    certificateUrl='certificate_url',
+    published='published',
+    linkedinPost='linkedin_post',
+    linkedinPostUrl='linkedin_post_url',
+    badgeImageUrl='badge_image_url',
+    additionalImages='additional_images',
+    sortOrder='sort_order',
+    createdAt='created_at',
+    updatedAt='updated_at',
+)
+
+COMMENT = Serializer(
+    Comment,
+    id='id',
+    userId='user_id',
+    authorName='author_name',
+    authorEmail='author_email',
+    itemType='item_type',
+    itemId='item_id',
+    content='content',
+    parentId='parent_id',
+    createdAt='created_at',
+    updatedAt='updated_at',
+)
+
+# List endpoints ship these; full bodies stay on the detail routes
+PROJECT_SUMMARY = PROJECT.without('description', 'linkedinPost', 'additionalImages')
+EXPERIENCE_SUMMARY = EXPERIENCE.without('description', 'linkedinPost', 'additionalImages')
+ACHIEVEMENT_SUMMARY = ACHIEVEMENT.without('description', 'linkedinPost', 'additionalImages')
@@ -20,6 +20,7 @@ export interface Project {
   id: string;
   title: string;
   description: string;
+  excerpt?: string;
   imageUrl?: string;
   githubUrl?: string;
   liveUrl?: string;
@@ -29,6 +30,7 @@ export interface Project {
   linkedinPost?: string;
   linkedinPostUrl?: string;
   additionalImages: string[];
+  sortOrder: number;
   createdAt: string;
   updatedAt: string;
 }
@@ -40,12 +42,14 @@ export interface Experience {
   startDate: string;
   endDate?: string;
   description: string;
+  excerpt?: string;
   technologies: string[];
   published: boolean;
   linkedinPost?: string;
   linkedinPostUrl?: string;
   companyLogoUrl?: string;
   additionalImages: string[];
+  sortOrder: number;
   createdAt: string;
   updatedAt: string;
 }
@@ -54,6 +58,7 @@ export interface Achievement {
   id: string;
   title: string;
   description: string;
+  excerpt?: string;
   date: string;
   type: string;
   certificateUrl?: string;
@@ -62,10 +67,17 @@ export interface Achievement {
   linkedinPostUrl?: string;
   badgeImageUrl?: string;
   additionalImages: string[];
+  sortOrder: number;
   createdAt: string;
   updatedAt: string;
 }
 
+// List endpoints return summaries; the full body comes from the detail routes
+type SummaryOmit = "description" | "linkedinPost" | "additionalImages";
+export type ProjectSummary = Omit<Project, SummaryOmit> & { excerpt: string };
+export type ExperienceSummary = Omit<Experience, SummaryOmit> & { excerpt: string };
+export type AchievementSummary = Omit<Achievement, SummaryOmit> & { excerpt: string };
+
 export interface Comment {
   id: string;
   userId?: string;
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from flask import request, has_request_context
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST_RE = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+_NAMED_PARAM_RE = re.compile(r'%\(\w+\)s|:\w+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(statement):
+    """Collapse literals, placeholders and whitespace so equivalent statements group together"""
+    sql = _STRING_RE.sub('?', statement)
+    sql = _NAMED_PARAM_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_LIST_RE.sub('(...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def parameter_shape(parameters, executemany=False):
+    """Describe bound parameters by type only, never by value"""
+    if executemany and parameters:
+        return {'rows': len(parameters), 'row': parameter_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Writes statements slower than a threshold to a rotating JSON-lines log"""
+    
+    def __init__(self, path, threshold_ms=100, max_bytes=1024 * 1024, backup_count=3):
+        self.path = path
+        self.threshold = threshold_ms / 1000
+        self.backup_count = backup_count
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.logger = logging.getLogger(f'slow_queries.{path}')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    def record(self, statement, parameters, duration, executemany=False):
+        if duration < self.threshold:
+            return
+        if has_request_context():
+            endpoint = request.endpoint or request.path
+        else:
+            endpoint = f"<{threading.current_thread().name}>"
+        
+        self.logger.info(json.dumps({
+            'at': datetime.utcnow().isoformat(),
+            'durationMs': round(duration * 1000, 3),
+            'endpoint': endpoint,
+            'sql': normalize_sql(statement),
+            'params': parameter_shape(parameters, executemany),
+        }, ensure_ascii=False))
+
+    def top_offenders(self, limit=20) -> list:
+        """Aggregate the log (including rotated files) by statement, slowest total first"""
+        stats = {}
+        paths = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backup_count + 1)]
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    item = stats.setdefault(entry['sql'], {
+                        'sql': entry['sql'],
+                        'count': 0,
+                        'totalMs': 0.0,
+                        'maxMs': 0.0,
+                        'endpoints': {},
+                        'params': entry.get('params'),
+                        'lastSeen': entry['at'],
+                    })
+                    item['count'] += 1
+                    item['totalMs'] += entry['durationMs']
+                    item['maxMs'] = max(item['maxMs'], entry['durationMs'])
+                    item['endpoints'][entry['endpoint']] = item['endpoints'].get(entry['endpoint'], 0) + 1
+                    item['lastSeen'] = max(item['lastSeen'], entry['at'])
+        
+        result = sorted(stats.values(), key=lambda item: item['totalMs'], reverse=True)[:limit]
+        for item in result:
+            item['totalMs'] = round(item['totalMs'], 3)
+            item['avgMs'] = round(item['totalMs'] / item['count'], 3)
+        return result
+
+
+def init_slow_query_log(app):
+    """Create the slow query log and subscribe it to tracked statements"""
+    from request_timing import observe_queries
+    
+    slow_log = SlowQueryLog(
+        app.config.get('SLOW_QUERY_LOG_FILE', 'logs/slow_queries.log'),
+        threshold_ms=app.config.get('SLOW_QUERY_THRESHOLD_MS', 100),
+        max_bytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 1024 * 1024),
+        backup_count=app.config.get('SLOW_QUERY_LOG_BACKUPS', 3)
+    )
+    observe_queries(app, slow_log.record)
+    app.extensions['slow_query_log'] = slow_log
+    return slow_log
@@ -0,0 +1,252 @@
+import html
+import os
+import re
+import click
+from flask import request, send_from_directory
+from models import db, User, Project, Experience, Achievement, Content
+from static_export import Debouncer, EXPORTED_TAGS
+import metrics
+
+# Crawlers and link-preview fetchers that get a pre-rendered page instead of the React shell
+BOT_USER_AGENT_RE = re.compile(
+    r'bot\b|crawler|spider|slurp|facebookexternalhit|embedly|whatsapp|skypeuripreview|'
+    r'bitlybot|outbrain|pinterest|quora link preview|vkshare|w3c_validator',
+    re.IGNORECASE
+)
+# Route prefix -> (model, title column, image column) of the client detail pages
+DETAIL_PAGES = {
+    'project': (Project, 'title', 'image_url'),
+    'experience': (Experience, 'position', 'company_logo_url'),
+    'achievement': (Achievement, 'title', 'badge_image_url'),
+}
+LIST_PAGES = {
+    'projects': ('Projetos', 'project', Project, 'title'),
+    'experiences': ('Experiências', 'experience', Experience, 'position'),
+    'achievements': ('Conquistas', 'achievement', Achievement, 'title'),
+}
+# Same fallbacks as the client's HeroSection
+DEFAULT_HERO_TITLE = 'Desenvolvedor Full Stack apaixonado por criar soluções digitais inovadoras.'
+DEFAULT_HERO_DESCRIPTION = 'Especializado em React, Node.js e tecnologias modernas de desenvolvimento web.'
+
+# Routes that can have a snapshot; anything else gets the client shell without a filesystem lookup
+_SNAPSHOT_PATH_RE = re.compile(
+    rf"^/(?:{'|'.join(LIST_PAGES)}|(?:{'|'.join(DETAIL_PAGES)})/[\w-]{{1,64}})?$"
+)
+
+
+def is_bot(user_agent) -> bool:
+    return bool(user_agent) and BOT_USER_AGENT_RE.search(user_agent) is not None
+
+
+def _paragraphs(text):
+    return ''.join(f'<p>{html.escape(part.strip())}</p>' for part in re.split(r'\n\s*\n', text or '') if part.strip())
+
+
+class SnapshotRenderer:
+    """Pre-rendered HTML of the public client routes for crawlers.
+
+    Each page is the built index.html with the title, description and Open Graph
+    tags of the route filled in and its text content inside #root. Pages are
+    written to <directory>/<route>.html, rendered on the first bot request and
+    re-rendered together after writes to the data they show.
+    """
+
+    def __init__(self, app, template, directory, site_url='', debounce=2.0, enabled=True):
+        self.app = app
+        self.enabled = enabled
+        self.template = template
+        self.directory = directory
+        self.site_url = site_url.rstrip('/')
+        self._debouncer = Debouncer(self.render_all, debounce, 'Snapshot rendering')
+
+    def _absolute(self, url):
+        return f'{self.site_url}{url}' if url and url.startswith('/') else url
+
+    def _site_name(self):
+        admin = db.session.execute(
+            db.select(User.first_name, User.last_name).where(User.is_admin == True).limit(1)
+        ).first()
+        name = ' '.join(part for part in (admin or ()) if part)
+        return name or 'Portfólio'
+
+    def _page(self, path):
+        """(title, description, image, body) of a route, or None when it has no snapshot"""
+        parts = path.strip('/').split('/')
+        if parts == ['']:
+            content = dict(db.session.execute(
+                db.select(Content.field, Content.content).where(Content.section == 'hero')
+            ).all())
+            name = self._site_name()
+            description = content.get('description') or DEFAULT_HERO_DESCRIPTION
+            featured = db.session.execute(
+                db.select(Project.id, Project.title)
+                .where(Project.published == True, Project.featured == True)
+                .order_by(Project.sort_order, Project.id)
+            ).all()
+            body = (
+                f'<h1>{html.escape(name)}</h1>'
+                f'<p>{html.escape(content.get("title") or DEFAULT_HERO_TITLE)}</p>'
+                f'<p>{html.escape(description)}</p>'
+                + ''.join(f'<a href="/{route}">{html.escape(label)}</a> ' for route, (label, *_) in LIST_PAGES.items())
+                + '<ul>' + ''.join(
+                    f'<li><a href="/project/{row.id}">{html.escape(row.title)}</a></li>' for row in featured
+                ) + '</ul>'
+            )
+            return name, description, None, body
+
+        if len(parts) == 1 and parts[0] in LIST_PAGES:
+            label, route, model, title_column = LIST_PAGES[parts[0]]
+            rows = db.session.execute(
+                db.select(model.id, getattr(model, title_column).label('title'), model.excerpt)
+                .where(model.published == True)
+                .order_by(model.sort_order, model.id)
+            ).all()
+            body = f'<h1>{html.escape(label)}</h1><ul>' + ''.join(
+                f'<li><a href="/{route}/{row.id}">{html.escape(row.title)}</a> {html.escape(row.excerpt or "")}</li>'
+                for row in rows
+            ) + '</ul>'
+            return f'{label} | {self._site_name()}', label, None, body
+
+        if len(parts) == 2 and parts[0] in DETAIL_PAGES:
+            model, title_column, image_column = DETAIL_PAGES[parts[0]]
+            columns = [
+                getattr(model, title_column).label('title'), model.description, model.excerpt,
+                getattr(model, image_column).label('image')
+            ]
+            if hasattr(model, 'technologies'):
+                columns.append(model.technologies)
+            item = db.session.execute(
+                db.select(*columns).where(model.id == parts[1], model.published == True)
+            ).first()
+            if item is None:
+                return None
+            body = f'<h1>{html.escape(item.title)}</h1>{_paragraphs(item.description)}'
+            technologies = item._mapping.get('technologies')
+            if technologies:
+                body += '<ul>' + ''.join(f'<li>{html.escape(tech)}</li>' for tech in technologies) + '</ul>'
+            return f'{item.title} | {self._site_name()}', item.excerpt or '', item.image, body
+
+        return None
+
+    def _render(self, template, path):
+        page = self._page(path)
+        if page is None:
+            return None
+        title, description, image, body = page
+        head = [
+            f'<title>{html.escape(title)}</title>',
+            f'<meta name="description" content="{html.escape(description)}" />',
+            f'<meta property="og:title" content="{html.escape(title)}" />',
+            f'<meta property="og:description" content="{html.escape(description)}" />',
+            f'<meta property="og:type" content="{"article" if path.count("/") > 1 else "website"}" />',
+        ]
+        if self.site_url:
+            head.append(f'<meta property="og:url" content="{html.escape(self.site_url + path)}" />')
+        if image:
+            head.append(f'<meta property="og:image" content="{html.escape(self._absolute(image))}" />')
+            head.append('<meta name="twitter:card" content="summary_large_image" />')
+        page_html = re.sub(r'<title>.*?</title>\s*', '', template, flags=re.DOTALL)
+        page_html = page_html.replace('</head>', '\n    '.join(head) + '\n  </head>', 1)
+        return page_html.replace('<div id="root"></div>', f'<div id="root">{body}</div>', 1)
+
+    def _filename(self, path):
+        return (path.strip('/') or 'index') + '.html'
+
+    def _write(self, path, page_html):
+        target = os.path.join(self.directory, self._filename(path))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(f'{target}.tmp', 'w', encoding='utf-8') as f:
+            f.write(page_html)
+        os.replace(f'{target}.tmp', target)
+
+    def _read_template(self):
+        try:
+            with open(self.template, encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, path):
+        """Filename of the snapshot of a route under `directory`, rendering it if needed"""
+        if not _SNAPSHOT_PATH_RE.match(path):
+            return None
+        filename = self._filename(path)
+        if os.path.exists(os.path.join(self.directory, filename)):
+            metrics.inc('cache_requests_total', cache='snapshot', result='hit')
+            return filename
+        metrics.inc('cache_requests_total', cache='snapshot', result='miss')
+        template = self._read_template()
+        page_html = template and self._render(template, path)
+        if not page_html:
+            return None
+        self._write(path, page_html)
+        return filename
+
+    def render_all(self) -> int:
+        """Re-render every route and drop snapshots of items no longer published"""
+        template = self._read_template()
+        if template is None:
+            return 0
+        with self.app.app_context():
+            paths = ['/'] + [f'/{route}' for route in LIST_PAGES]
+            for route, (model, *_) in DETAIL_PAGES.items():
+                ids = db.session.execute(db.select(model.id).where(model.published == True)).scalars()
+                paths += [f'/{route}/{item_id}' for item_id in ids]
+            for path in paths:
+                page_html = self._render(template, path)
+                if page_html:
+                    self._write(path, page_html)
+
+        keep = {self._filename(path) for path in paths}
+        for route in DETAIL_PAGES:
+            route_directory = os.path.join(self.directory, route)
+            if os.path.isdir(route_directory):
+                for filename in os.listdir(route_directory):
+                    if f'{route}/{filename}' not in keep:
+                        os.remove(os.path.join(route_directory, filename))
+        return len(paths)
+
+    def schedule(self, *tags):
+        """Re-render shortly after writes to the data shown on the pages"""
+        if tags and not set(tags) & set(EXPORTED_TAGS):
+            return
+        self._debouncer.trigger()
+
+    def serve(self, path):
+        """Snapshot response for a bot request, or None to serve the client shell"""
+        if not self.enabled or not is_bot(request.user_agent.string):
+            return None
+        filename = self.get(f'/{path}')
+        if filename is None:
+            return None
+        return send_from_directory(self.directory, filename, mimetype='text/html')
+
+
+def init_snapshots(app):
+    """Register `flask render-snapshots` and keep snapshots current after writes"""
+    # Relative to the app like serve_frontend's dist/public, not to the working directory
+    static_dir = os.path.join(app.root_path, app.config.get('STATIC_EXPORT_DIR', 'dist/public'))
+    renderer = SnapshotRenderer(
+        app,
+        os.path.join(static_dir, 'index.html'),
+        os.path.join(app.root_path, app.config.get('SNAPSHOT_DIR', os.path.join(static_dir, 'snapshots'))),
+        site_url=app.config.get('SITE_URL', ''),
+        debounce=app.config.get('STATIC_EXPORT_DEBOUNCE', 2.0),
+        enabled=app.config.get('SNAPSHOTS_ENABLED', True)
+    )
+    app.extensions['snapshots'] = renderer
+
+    @app.cli.command('render-snapshots')
+    def render_snapshots_command():
+        """Pre-render the public pages served to crawlers."""
+        count = renderer.render_all()
+        if count:
+            click.echo(f"Rendered {count} pages to {renderer.directory}")
+        else:
+            click.echo(f"{renderer.template} not found, run `npm run build` first")
+
+    if renderer.enabled:
+        # Snapshots live on the shared filesystem; the worker that made the write re-renders
+        app.extensions['invalidation_bus'].subscribe(renderer.schedule, local_only=True)
+
+    return renderer
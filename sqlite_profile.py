@@ -0,0 +1,66 @@
+import time
+from sqlalchemy import event
+from worker_thread import WorkerThread
+
+
+def apply_pragmas(dbapi_connection, pragmas: dict):
+    """Run the PRAGMA statements of a profile on a raw DB-API connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def init_sqlite_profile(app, engine, read_only=False):
+    """Apply the configured SQLite profile to every new connection of the engine"""
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    profile = app.config.get('SQLITE_PROFILE', 'default')
+    pragmas = app.config.get('SQLITE_PROFILES', {}).get(profile)
+    if pragmas is None:
+        raise ValueError(f"Unknown SQLITE_PROFILE: {profile}")
+    
+    if read_only:
+        # The journal mode is a property of the file, owned by the primary engine
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+        pragmas['query_only'] = 1
+    
+    if pragmas:
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            apply_pragmas(dbapi_connection, pragmas)
+    
+    interval = app.config.get('SQLITE_WAL_CHECKPOINT_INTERVAL', 0)
+    if not read_only and str(pragmas.get('journal_mode', '')).upper() == 'WAL' and interval > 0:
+        checkpointer = WalCheckpointer(engine, interval, app.config.get('SQLITE_WAL_CHECKPOINT_MODE', 'PASSIVE'))
+        app.extensions['wal_checkpointer'] = checkpointer
+        # Threads don't survive a fork, so each worker starts its own on its first request
+        app.before_request(checkpointer.ensure_running)
+
+
+class WalCheckpointer:
+    """Background thread that periodically folds the WAL back into the database file"""
+    
+    def __init__(self, engine, interval, mode='PASSIVE'):
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode
+        self._thread = WorkerThread(self._run, 'sqlite-wal-checkpoint')
+
+    def ensure_running(self):
+        self._thread.ensure_running()
+
+    def checkpoint(self):
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(f"PRAGMA wal_checkpoint({self.mode})").first()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print(f"WAL checkpoint failed: {e}")
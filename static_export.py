@@ -0,0 +1,158 @@
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import click
+from models import db, Project, Experience, Achievement
+
+# Exported as-is; published items also get their detail route exported
+PUBLIC_ENDPOINTS = (
+    '/api/profile',
+    '/api/content',
+    '/api/projects',
+    '/api/projects/featured',
+    '/api/experiences',
+    '/api/achievements',
+    '/api/technologies',
+)
+DETAIL_ROUTES = (
+    ('/api/projects/{}', Project),
+    ('/api/experiences/{}', Experience),
+    ('/api/achievements/{}', Achievement),
+)
+# Tags whose changes show up in the exported data
+EXPORTED_TAGS = ('project', 'experience', 'achievement', 'content', 'profile')
+
+
+class Debouncer:
+    """Runs a function `delay` seconds after the last call to trigger(), on a timer thread"""
+
+    def __init__(self, function, delay, name):
+        self.function = function
+        self.delay = delay
+        self.name = name
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def trigger(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self):
+        try:
+            self.function()
+        except Exception as e:
+            print(f"{self.name} failed: {e}")
+
+
+class StaticExporter:
+    """Renders the public read endpoints to fingerprinted JSON files for a static web server.
+
+    Files go to <directory>/data/<name>.<hash>.json and data/manifest.json maps each
+    API path to its current file. Files of the previous export are kept so pages
+    loaded just before a re-export can still fetch them. The manifest's `live` flag
+    tells clients whether writes keep the export current; without it they use the API.
+    """
+
+    def __init__(self, app, directory, debounce=2.0, enabled=True):
+        self.app = app
+        self.enabled = enabled
+        self.directory = directory
+        self.data_directory = os.path.join(directory, 'data')
+        self.manifest_path = os.path.join(self.data_directory, 'manifest.json')
+        self._lock = threading.Lock()
+        self._debouncer = Debouncer(self.export, debounce, 'Static export')
+
+    def _paths(self):
+        paths = list(PUBLIC_ENDPOINTS)
+        for route, model in DETAIL_ROUTES:
+            ids = db.session.execute(db.select(model.id).where(model.published == True)).scalars()
+            paths += [route.format(item_id) for item_id in ids]
+        return paths
+
+    def _write(self, path, body):
+        name = path[len('/api/'):].replace('/', '_')
+        filename = f'{name}.{hashlib.sha256(body).hexdigest()[:12]}.json'
+        target = os.path.join(self.data_directory, filename)
+        if not os.path.exists(target):
+            tmp_path = f'{target}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, target)
+        return f'/data/{filename}'
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'files': {}}
+
+    def export(self) -> dict:
+        """Render every public path and swap in the new manifest"""
+        started = time.perf_counter()
+        os.makedirs(self.data_directory, exist_ok=True)
+        with self._lock, open(os.path.join(self.data_directory, '.lock'), 'w') as lock_file:
+            # One exporting worker at a time
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            with self.app.app_context():
+                paths = self._paths()
+            client = self.app.test_client()
+            files = {}
+            for path in paths:
+                response = client.get(path)
+                if response.status_code == 200:
+                    files[path] = self._write(path, response.get_data())
+
+            previous = self._read_manifest()
+            manifest = {'generatedAt': datetime.utcnow().isoformat(), 'live': self.enabled, 'files': files}
+            with open(f'{self.manifest_path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(f'{self.manifest_path}.tmp', self.manifest_path)
+
+            keep = {os.path.basename(url) for url in list(files.values()) + list(previous['files'].values())}
+            for filename in os.listdir(self.data_directory):
+                if filename.endswith('.json') and filename != 'manifest.json' and filename not in keep:
+                    os.remove(os.path.join(self.data_directory, filename))
+
+        manifest['seconds'] = round(time.perf_counter() - started, 3)
+        return manifest
+
+    def schedule(self, *tags):
+        """Re-export shortly after a write; writes in quick succession share one export"""
+        if tags and not set(tags) & set(EXPORTED_TAGS):
+            return
+        # Sites that never ran `flask export-static` don't serve the data statically
+        if not os.path.exists(self.manifest_path):
+            return
+        self._debouncer.trigger()
+
+
+def init_static_export(app):
+    """Register `flask export-static` and re-export after writes unless STATIC_EXPORT_ENABLED is off"""
+    exporter = StaticExporter(
+        app,
+        os.path.join(app.root_path, app.config.get('STATIC_EXPORT_DIR', 'dist/public')),
+        debounce=app.config.get('STATIC_EXPORT_DEBOUNCE', 2.0),
+        enabled=app.config.get('STATIC_EXPORT_ENABLED', True)
+    )
+    app.extensions['static_export'] = exporter
+
+    @app.cli.command('export-static')
+    def export_static_command():
+        """Render the public API to fingerprinted JSON in dist/public/data."""
+        manifest = exporter.export()
+        click.echo(f"Exported {len(manifest['files'])} files to {exporter.data_directory} in {manifest['seconds']}s")
+
+    if exporter.enabled:
+        # Each worker exports after its own writes
+        app.extensions['invalidation_bus'].subscribe(exporter.schedule, local_only=True)
+
+    return exporter
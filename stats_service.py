@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from models import db, Like, Comment, Project, Experience, Achievement, ItemStats, DailyStats
+
+# Item types ranked under top items, with the column shown as their title
+TITLED_ITEMS = {
+    'project': (Project, Project.title),
+    'experience': (Experience, Experience.position),
+    'achievement': (Achievement, Achievement.title),
+}
+
+
+# INSERT ... ON CONFLICT DO UPDATE per dialect
+UPSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def _update_counts(model, keys, deltas):
+    return db.session.execute(
+        db.update(model).filter_by(**keys).values(
+            {getattr(model, column): getattr(model, column) + delta for column, delta in deltas.items()}
+        ).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def increment_counts(model, keys: dict, **deltas):
+    """Add deltas to the counter columns of the row with the given key, creating it if missing.
+
+    A single upsert, so two transactions recording the first event of the same key
+    don't both try to insert it.
+    """
+    upsert = UPSERTS.get(db.session.get_bind(mapper=model).dialect.name)
+    if upsert is not None:
+        statement = upsert(model).values(**keys, **deltas)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: getattr(model, column) + getattr(statement.excluded, column) for column in deltas}
+        ))
+        return
+    if not _update_counts(model, keys, deltas):
+        try:
+            with db.session.begin_nested():
+                db.session.execute(db.insert(model).values(**keys, **deltas))
+        except IntegrityError:
+            # Created by a concurrent transaction since the UPDATE
+            _update_counts(model, keys, deltas)
+
+
+class StatsService:
+    @staticmethod
+    def _record(item_type: str, item_id: str, created_at, likes=0, comments=0):
+        increment_counts(ItemStats, {'item_type': item_type, 'item_id': item_id}, like_count=likes, comment_count=comments)
+        day = (created_at or datetime.utcnow()).date()
+        increment_counts(DailyStats, {'day': day, 'item_type': item_type}, like_count=likes, comment_count=comments)
+
+    @staticmethod
+    def like_added(like, delta=1):
+        """Count a new like (delta=-1: a removed one). Runs inside the caller's transaction"""
+        StatsService._record(like.item_type, like.item_id, like.created_at, likes=delta)
+
+    @staticmethod
+    def comment_added(comment, delta=1):
+        """Count a new comment or contact message (delta=-1: a deleted one). Runs inside the caller's transaction"""
+        StatsService._record(comment.item_type, comment.item_id, comment.created_at, comments=delta)
+
+    @staticmethod
+    def remove_item(item_type: str, item_id: str):
+        """Drop the totals of a deleted item so it leaves the rankings. Daily counts keep its history"""
+        db.session.execute(db.delete(ItemStats).where(
+            ItemStats.item_type == item_type, ItemStats.item_id == item_id
+        ))
+
+    @staticmethod
+    def rebuild():
+        """Recompute both aggregate tables from likes and comments"""
+        db.session.execute(db.delete(ItemStats))
+        db.session.execute(db.delete(DailyStats))
+
+        items = {}
+        days = {}
+        for model, field in ((Like, 'like_count'), (Comment, 'comment_count')):
+            rows = db.session.execute(
+                db.select(model.item_type, model.item_id, func.count()).group_by(model.item_type, model.item_id)
+            )
+            for item_type, item_id, total in rows:
+                items.setdefault((item_type, item_id), {'like_count': 0, 'comment_count': 0})[field] = total
+            # Grouped in Python: date functions differ between SQLite and PostgreSQL
+            rows = db.session.execute(db.select(model.item_type, model.created_at))
+            for item_type, created_at in rows:
+                counts = days.setdefault((created_at.date(), item_type), {'like_count': 0, 'comment_count': 0})
+                counts[field] += 1
+
+        if items:
+            db.session.execute(db.insert(ItemStats), [
+                {'item_type': item_type, 'item_id': item_id, **counts} for (item_type, item_id), counts in items.items()
+            ])
+        if days:
+            db.session.execute(db.insert(DailyStats), [
+                {'day': day, 'item_type': item_type, **counts} for (day, item_type), counts in days.items()
+            ])
+        db.session.commit()
+
+    @staticmethod
+    def summary(days=30, top=10) -> dict:
+        """Dashboard totals, top items and daily counts, read from the aggregate tables only"""
+        totals = {}
+        rows = db.session.execute(
+            db.select(
+                ItemStats.item_type,
+                func.count(),
+                func.sum(ItemStats.like_count),
+                func.sum(ItemStats.comment_count)
+            ).group_by(ItemStats.item_type)
+        )
+        for item_type, items, likes, comments in rows:
+            totals[item_type] = {'items': items, 'likes': likes or 0, 'comments': comments or 0}
+
+        engagement = ItemStats.like_count + ItemStats.comment_count
+        ranked = db.session.execute(
+            db.select(ItemStats.item_type, ItemStats.item_id, ItemStats.like_count, ItemStats.comment_count)
+            .where(ItemStats.item_type.in_(TITLED_ITEMS), engagement > 0)
+            .order_by(engagement.desc())
+            .limit(top)
+        ).all()
+        titles = {}
+        for item_type, (model, title) in TITLED_ITEMS.items():
+            ids = [row.item_id for row in ranked if row.item_type == item_type]
+            if ids:
+                titles.update({
+                    (item_type, item_id): value
+                    for item_id, value in db.session.execute(db.select(model.id, title).where(model.id.in_(ids)))
+                })
+        top_items = [{
+            'itemType': row.item_type,
+            'itemId': row.item_id,
+            'title': titles.get((row.item_type, row.item_id)),
+            'likeCount': row.like_count,
+            'commentCount': row.comment_count,
+        } for row in ranked]
+
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        daily = {}
+        rows = db.session.execute(
+            db.select(DailyStats.day, DailyStats.item_type, DailyStats.like_count, DailyStats.comment_count)
+            .where(DailyStats.day >= since)
+            .order_by(DailyStats.day)
+        )
+        for day, item_type, likes, comments in rows:
+            entry = daily.setdefault(day, {'date': day.isoformat(), 'likes': 0, 'comments': 0, 'contacts': 0})
+            entry['likes'] += likes
+            entry['contacts' if item_type == 'contact' else 'comments'] += comments
+
+        return {'totals': totals, 'topItems': top_items, 'daily': list(daily.values())}
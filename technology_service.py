@@ -0,0 +1,122 @@
+import re
+from sqlalchemy import func
+from models import db, Project, Experience, Technology, ItemTechnology
+
+TAGGED_MODELS = {'project': Project, 'experience': Experience}
+
+
+def normalize_technology(name):
+    """Normalize a technology name into its tag slug ("  Node.JS " -> "node.js")"""
+    return re.sub(r'\s+', ' ', str(name or '')).strip().lower()
+
+
+def parse_tech_filter(value):
+    """Parse a comma separated ?tech= value into a list of unique slugs"""
+    slugs = []
+    for part in (value or '').split(','):
+        slug = normalize_technology(part)
+        if slug and slug not in slugs:
+            slugs.append(slug)
+    return slugs
+
+
+class TechnologyService:
+    @staticmethod
+    def sync_item(item_type: str, item):
+        """Refresh the tag rows and usage counts of an item. Runs inside the caller's transaction"""
+        old_slugs = TechnologyService._clear_item(item_type, item.id)
+        db.session.flush()
+        
+        new_slugs = []
+        for name in item.technologies or []:
+            slug = normalize_technology(name)
+            if not slug or slug in new_slugs:
+                continue
+            new_slugs.append(slug)
+            if not db.session.get(Technology, slug):
+                db.session.add(Technology(slug=slug, name=str(name).strip()))
+            db.session.add(ItemTechnology(
+                item_type=item_type,
+                item_id=item.id,
+                technology_slug=slug,
+                published=bool(item.published)
+            ))
+        
+        db.session.flush()
+        TechnologyService._refresh_counts(set(old_slugs) | set(new_slugs))
+
+    @staticmethod
+    def remove_item(item_type: str, item_id: str):
+        """Drop the tag rows of a deleted item. Runs inside the caller's transaction"""
+        old_slugs = TechnologyService._clear_item(item_type, item_id)
+        db.session.flush()
+        TechnologyService._refresh_counts(set(old_slugs))
+
+    @staticmethod
+    def rebuild():
+        """Rebuild the whole tag index from the technologies JSON columns"""
+        ItemTechnology.query.delete()
+        Technology.query.delete()
+        db.session.flush()
+        for item_type, model in TAGGED_MODELS.items():
+            for item in model.query.all():
+                TechnologyService.sync_item(item_type, item)
+        db.session.commit()
+
+    @staticmethod
+    def filter_ids(item_type: str, slugs: list):
+        """Subquery of published item ids tagged with every given technology"""
+        return db.session.query(ItemTechnology.item_id).filter(
+            ItemTechnology.item_type == item_type,
+            ItemTechnology.technology_slug.in_(slugs),
+            ItemTechnology.published.is_(True)
+        ).group_by(ItemTechnology.item_id).having(
+            func.count(ItemTechnology.technology_slug) == len(slugs)
+        )
+
+    @staticmethod
+    def usage(item_type: str | None = None) -> list:
+        """Technologies in use with their precomputed counts, most used first"""
+        query = Technology.query
+        if item_type == 'project':
+            query = query.filter(Technology.project_count > 0).order_by(Technology.project_count.desc())
+        elif item_type == 'experience':
+            query = query.filter(Technology.experience_count > 0).order_by(Technology.experience_count.desc())
+        else:
+            total = Technology.project_count + Technology.experience_count
+            query = query.filter(total > 0).order_by(total.desc())
+        
+        return [{
+            'name': tech.name,
+            'slug': tech.slug,
+            'projectCount': tech.project_count,
+            'experienceCount': tech.experience_count
+        } for tech in query.order_by(Technology.name).all()]
+
+    @staticmethod
+    def _clear_item(item_type, item_id):
+        rows = ItemTechnology.query.filter_by(item_type=item_type, item_id=item_id).all()
+        for row in rows:
+            db.session.delete(row)
+        return [row.technology_slug for row in rows]
+
+    @staticmethod
+    def _refresh_counts(slugs):
+        if not slugs:
+            return
+        counts = db.session.query(
+            ItemTechnology.technology_slug,
+            ItemTechnology.item_type,
+            func.count()
+        ).filter(
+            ItemTechnology.technology_slug.in_(slugs),
+            ItemTechnology.published.is_(True)
+        ).group_by(ItemTechnology.technology_slug, ItemTechnology.item_type).all()
+        
+        by_slug = {}
+        for slug, item_type, count in counts:
+            by_slug.setdefault(slug, {})[item_type] = count
+        
+        for tech in Technology.query.filter(Technology.slug.in_(slugs)).all():
+            tech.project_count = by_slug.get(tech.slug, {}).get('project', 0)
+            tech.experience_count = by_slug.get(tech.slug, {}).get('experience', 0)
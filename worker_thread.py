@@ -0,0 +1,30 @@
+import os
+import threading
+
+
+class WorkerThread:
+    """Daemon thread started at most once per process.
+
+    Threads don't survive a fork, so each worker process starts its own the first
+    time ensure_running() is called in it, usually from a before_request hook.
+    `before_start` runs under the lock first, e.g. to replace state inherited from
+    the parent process.
+    """
+
+    def __init__(self, target, name, before_start=None):
+        self.target = target
+        self.name = name
+        self.before_start = before_start
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_running(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self.before_start is not None:
+                self.before_start()
+            threading.Thread(target=self.target, name=self.name, daemon=True).start()
+            self._pid = os.getpid()
@@ -0,0 +1,82 @@
+import queue
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from models import db
+from worker_thread import WorkerThread
+
+
+class WriteQueueBusy(Exception):
+    """Raised when a write could not be scheduled within the configured wait"""
+
+
+class WriteQueue:
+    """Funnels writes through one dedicated writer thread so SQLite never sees two writers"""
+    
+    def __init__(self, app, enabled=True, maxsize=256, timeout=10.0):
+        self.app = app
+        self.enabled = enabled
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._writer = WorkerThread(self._run, 'sqlite-writer', before_start=self._reset_queue)
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the writer thread and return its result.
+        
+        fn runs inside its own app context and must commit its own work. If the
+        queue stays full, or the job hasn't started within the timeout (counted
+        from the call), it is dropped and WriteQueueBusy is raised.
+        """
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        
+        self._writer.ensure_running()
+        # One deadline for both waits, so callers give up after `timeout` seconds in total
+        deadline = time.monotonic() + self.timeout
+        future = Future()
+        try:
+            self._queue.put((future, fn, args, kwargs), timeout=self.timeout)
+        except queue.Full:
+            raise WriteQueueBusy('Write queue is full')
+        
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeout:
+            if future.cancel():
+                raise WriteQueueBusy('Timed out waiting for the writer')
+            # Already running, so it will finish shortly
+            return future.result()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _reset_queue(self):
+        # Jobs inherited from the parent process have no writer to run them
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+
+    def _run(self):
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self.app.app_context():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as e:
+                    db.session.rollback()
+                    future.set_exception(e)
+
+
+def init_write_queue(app):
+    """Create the write queue. Enabled by default only for SQLite"""
+    enabled = app.config.get('WRITE_QUEUE_ENABLED')
+    if enabled is None:
+        enabled = app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+    
+    write_queue = WriteQueue(
+        app,
+        enabled=enabled,
+        maxsize=app.config.get('WRITE_QUEUE_MAXSIZE', 256),
+        timeout=app.config.get('WRITE_QUEUE_TIMEOUT', 10.0)
+    )
+    app.extensions['write_queue'] = write_queue
+    return write_queue